@@ -0,0 +1,211 @@
+"""
+Benchmarks du pipeline de prix : génération de paniers synthétiques,
+temps et débit par étape (parse, classify, price, et price_vectorized
+si NumPy est installé), pic mémoire, et
+comparaison à une référence enregistrée.
+
+    python -m benchmarks.bench_pipeline --output resultats.json
+    python -m benchmarks.bench_pipeline --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_pipeline --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Tuple
+
+from src import InputParser, PriceCalculator, PricingCache
+from src.rules import get_rules
+
+try:
+    import numpy as np
+    from src.vectorized import VectorizedPriceCalculator
+except ImportError:
+    np = None
+
+BTTF_TITLES = ["Back to the Future 1", "Back to the Future 2", "Back to the Future 3"]
+OTHER_TITLES = [f"Film {i}" for i in range(500)]
+
+# Relative throughput drop above which a stage is reported as a regression
+DEFAULT_TOLERANCE = 0.20
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    nb_baskets: int
+    min_size: int
+    max_size: int
+    # Probability that a movie repeats a title already in its basket
+    duplicate_ratio: float
+    # Probability that a new title is a BTTF volume
+    bttf_ratio: float
+    seed: int = 0
+
+SCENARIOS = [
+    Scenario("small-mixed", 100_000, 1, 3, 0.1, 0.5),
+    Scenario("medium-bttf", 50_000, 4, 10, 0.3, 0.8),
+    Scenario("medium-other", 50_000, 4, 10, 0.0, 0.1),
+    Scenario("large-duplicates", 5_000, 50, 100, 0.6, 0.5),
+]
+
+def generate_baskets(scenario: Scenario, scale: float = 1.0) -> List[List[str]]:
+    """
+    Génère des paniers de façon déterministe à partir de la graine du scénario.
+    """
+    rng = random.Random(scenario.seed)
+    baskets = []
+    for _ in range(max(1, int(scenario.nb_baskets * scale))):
+        basket: List[str] = []
+        for _ in range(rng.randint(scenario.min_size, scenario.max_size)):
+            if basket and rng.random() < scenario.duplicate_ratio:
+                basket.append(rng.choice(basket))
+            elif rng.random() < scenario.bttf_ratio:
+                basket.append(rng.choice(BTTF_TITLES))
+            else:
+                basket.append(rng.choice(OTHER_TITLES))
+        baskets.append(basket)
+    return baskets
+
+def to_text(baskets: List[List[str]]) -> List[str]:
+    lines: List[str] = []
+    for basket in baskets:
+        lines.extend(basket)
+        lines.append("")
+    return lines
+
+def run_stages(lines: List[str], cache: bool = False) -> Tuple[Dict[str, float], int]:
+    """
+    Exécute parse, classify et price l'un après l'autre et retourne le
+    temps de chaque étape ainsi que le nombre de paniers.
+    """
+    perf_counter = time.perf_counter
+    timings: Dict[str, float] = {}
+
+    start = perf_counter()
+    baskets = [movies for _, movies in InputParser.iter_baskets(lines)]
+    timings["parse"] = perf_counter() - start
+
+    rules = get_rules()
+    title_id = rules.catalog.title_id
+    start = perf_counter()
+    id_baskets = [[title_id(m.title) for m in movies] for movies in baskets]
+    timings["classify"] = perf_counter() - start
+
+    pricing_cache = PricingCache() if cache else None
+    calculate = PriceCalculator.calculate_total_cents
+    start = perf_counter()
+    for title_ids in id_baskets:
+        calculate(title_ids, pricing_cache, rules)
+    timings["price"] = perf_counter() - start
+
+    if np is not None and not cache:
+        offsets = np.cumsum([0] + [len(title_ids) for title_ids in id_baskets])
+        flat_ids = np.fromiter((t for title_ids in id_baskets for t in title_ids), dtype=np.int64, count=offsets[-1])
+        saga_indexes = np.asarray(rules.catalog.saga_indexes, dtype=np.int64)
+        start = perf_counter()
+        VectorizedPriceCalculator.calculate_totals_cents(flat_ids, offsets, saga_indexes, rules)
+        timings["price_vectorized"] = perf_counter() - start
+
+    return timings, len(baskets)
+
+def peak_memory(lines: List[str]) -> int:
+    """
+    Pic mémoire (octets, via tracemalloc) du pipeline en flux, mesuré à part
+    car tracemalloc ralentit fortement l'exécution.
+    """
+    tracemalloc.start()
+    try:
+        for _, movies in InputParser.iter_baskets(lines):
+            PriceCalculator.calculate_total(movies)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_scenario(scenario: Scenario, scale: float = 1.0, repeat: int = 3) -> Dict:
+    lines = to_text(generate_baskets(scenario, scale))
+    nb_movies = sum(1 for line in lines if line)
+
+    # Best of repeat runs; the first one also warms the catalog
+    best: Dict[str, float] = {}
+    for _ in range(repeat):
+        timings, nb_baskets = run_stages(lines)
+        for stage, seconds in timings.items():
+            best[stage] = min(best.get(stage, seconds), seconds)
+    cached_timings, _ = run_stages(lines, cache=True)
+
+    stages = {
+        stage: {"seconds": seconds, "baskets_per_s": nb_baskets / seconds if seconds else None}
+        for stage, seconds in best.items()
+    }
+    stages["price_cached"] = {
+        "seconds": cached_timings["price"],
+        "baskets_per_s": nb_baskets / cached_timings["price"] if cached_timings["price"] else None,
+    }
+    return {
+        "scenario": asdict(scenario),
+        "baskets": nb_baskets,
+        "movies": nb_movies,
+        "stages": stages,
+        "peak_memory_bytes": peak_memory(lines),
+    }
+
+def compare(results: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Retourne les régressions : étapes dont le débit a baissé de plus de
+    tolerance par rapport à la référence.
+    """
+    regressions = []
+    for name, result in results["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if reference is None:
+            continue
+        for stage, measure in result["stages"].items():
+            expected = reference["stages"].get(stage, {}).get("baskets_per_s")
+            actual = measure["baskets_per_s"]
+            if expected and actual and actual < expected * (1 - tolerance):
+                regressions.append(f"{name}/{stage}: {actual:,.0f} paniers/s contre {expected:,.0f} ({actual / expected - 1:+.0%})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline de prix")
+    parser.add_argument("--scale", type=float, default=1.0, help="Facteur appliqué au nombre de paniers")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de mesures par étape (la meilleure est gardée)")
+    parser.add_argument("--scenario", action="append", help="Limite aux scénarios nommés")
+    parser.add_argument("--output", help="Écrit les résultats JSON dans ce fichier")
+    parser.add_argument("--baseline", help="Référence JSON à comparer")
+    parser.add_argument("--save-baseline", help="Enregistre les résultats comme référence")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Baisse de débit tolérée avant de signaler une régression")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scale": args.scale,
+        "scenarios": {},
+    }
+    for scenario in scenarios:
+        result = results["scenarios"][scenario.name] = run_scenario(scenario, args.scale, args.repeat)
+        summary = "  ".join(f"{stage} {m['baskets_per_s']:,.0f}/s" for stage, m in result["stages"].items())
+        print(f"{scenario.name:<18} {summary}  pic {result['peak_memory_bytes'] / 1024:,.0f} Kio", file=sys.stderr)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"RÉGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
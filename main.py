@@ -1,23 +1,167 @@
+import argparse
 import sys
-from src import InputParser, PriceCalculator
+from src import InputParser, PriceCalculator, BatchPricer, PipelineStats, PricingCache, PricingRules, format_total, set_rules
+from src.batch import DEFAULT_BUFFER_LINES
 
-def main():
-    if sys.stdin.isatty():
-        print("Veuillez entrer les titres des films dans le panier, un par ligne. Terminez par Ctrl+Z (Windows) puis Entrée.", file=sys.stderr)
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Calculateur de prix BTTF")
+    parser.add_argument("input", nargs="?", help="Fichier de paniers (stdin par défaut)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Plusieurs paniers séparés par une ligne vide, un total par ligne")
+    parser.add_argument("--ids", action="store_true",
+                        help="Mode batch avec une colonne identifiant (\"<id>\\t<titre>\")")
+    parser.add_argument("--mmap", action="store_true",
+                        help="Mode batch : lit le fichier par projection mémoire, sans le décoder")
+    parser.add_argument("--buffer-lines", type=int,
+                        help=f"Nombre de lignes écrites par bloc en mode batch ({DEFAULT_BUFFER_LINES} par défaut)")
+    parser.add_argument("--rules",
+                        help="Fichier JSON de promotions (règles de models par défaut)")
+    parser.add_argument("--cache-size", type=int,
+                        help="Mémorise les totaux par panier (0 pour désactiver, "
+                             "désactivé par défaut sauf pour --serve)")
+    parser.add_argument("--stats", action="store_true",
+                        help="Affiche sur stderr les temps par étape et les compteurs")
+    parser.add_argument("--serve", metavar="ADRESSE",
+                        help="Lance le serveur de prix sur \"hôte:port\" ou une socket Unix")
+    parser.add_argument("--workers", type=int,
+                        help="Calcule le fichier en parallèle avec ce nombre de processus")
+    parser.add_argument("--chunk-size", type=int,
+                        help="Taille en octets des blocs confiés à chaque processus")
+    args = parser.parse_args(argv)
+    if args.workers is not None and not args.input:
+        parser.error("--workers nécessite un fichier d'entrée")
+    if args.cache_size is not None and args.cache_size < 0:
+        parser.error("--cache-size doit être positif ou nul")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers doit être supérieur ou égal à 1")
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error("--chunk-size doit être supérieur ou égal à 1")
+    if args.workers is not None:
+        # Each worker writes its own chunk, these options would be silently ignored
+        for option, given in (("--cache-size", args.cache_size is not None),
+                              ("--buffer-lines", args.buffer_lines is not None),
+                              ("--mmap", args.mmap), ("--stats", args.stats)):
+            if given:
+                parser.error(f"{option} n'est pas disponible avec --workers")
+    if args.serve:
+        # The server reads its requests from the network, these options would be silently ignored
+        for option, given in (("un fichier d'entrée", args.input is not None), ("--batch", args.batch),
+                              ("--ids", args.ids), ("--mmap", args.mmap), ("--stats", args.stats),
+                              ("--buffer-lines", args.buffer_lines is not None),
+                              ("--workers", args.workers is not None), ("--chunk-size", args.chunk_size is not None)):
+            if given:
+                parser.error(f"{option} n'est pas disponible avec --serve")
+    if args.buffer_lines is None:
+        args.buffer_lines = DEFAULT_BUFFER_LINES
+    elif args.buffer_lines < 1:
+        parser.error("--buffer-lines doit être supérieur ou égal à 1")
+    if args.mmap and not args.input:
+        parser.error("--mmap nécessite un fichier d'entrée")
+
+    # Loaded here so that a missing or invalid file is reported like any other bad option
+    args.pricing_rules = None
+    if args.rules:
+        try:
+            args.pricing_rules = PricingRules.from_file(args.rules)
+        except (OSError, ValueError) as exc:
+            parser.error(f"--rules {args.rules} : {exc}")
+    return args
+
+def run_batch(stream, with_ids, buffer_lines, cache_size, stats=None):
+    cache = PricingCache(cache_size) if cache_size else None
+    baskets = InputParser.iter_baskets(stream, with_ids=with_ids)
+    if stats is not None:
+        baskets = stats.timed_iter("parse", baskets)
+    BatchPricer.write_buffered(BatchPricer.price_baskets(baskets, cache, stats), sys.stdout, buffer_lines)
+    count_cache(stats, cache)
+
+def run_mapped_batch(path, with_ids, buffer_lines, cache_size, stats=None):
+    cache = PricingCache(cache_size) if cache_size else None
+    baskets = InputParser.iter_file_ids(path, with_ids=with_ids)
+    if stats is not None:
+        # Titles are classified while the bytes are scanned
+        baskets = stats.timed_iter("parse", baskets)
+    BatchPricer.write_buffered(BatchPricer.price_id_baskets(baskets, cache, stats), sys.stdout, buffer_lines)
+    count_cache(stats, cache)
+
+def count_cache(stats, cache):
+    if stats is not None and cache is not None:
+        stats.count("cache_hits", cache.hits)
+        stats.count("cache_misses", cache.misses)
+
+def run(args, stats=None):
+    if args.pricing_rules is not None:
+        set_rules(args.pricing_rules)
+
+    if args.workers is not None:
+        # Imported here so that one-shot runs do not pay for multiprocessing
+        from src.parallel import ParallelRepricer, DEFAULT_CHUNK_SIZE
+        chunk_size = DEFAULT_CHUNK_SIZE if args.chunk_size is None else args.chunk_size
+        ParallelRepricer.reprice_file(args.input, sys.stdout, args.workers, chunk_size, args.ids, args.rules)
+        return
+
+    if args.mmap:
+        run_mapped_batch(args.input, args.ids, args.buffer_lines, args.cache_size, stats)
+        return
+
+    if args.batch or args.ids:
+        if args.input:
+            with open(args.input, encoding="utf-8") as stream:
+                run_batch(stream, args.ids, args.buffer_lines, args.cache_size, stats)
+        else:
+            run_batch(sys.stdin, args.ids, args.buffer_lines, args.cache_size, stats)
+        return
+
+    if args.input:
+        with open(args.input, encoding="utf-8") as stream:
+            input_data = stream.read().strip()
+    else:
+        if sys.stdin.isatty():
+            print("Veuillez entrer les titres des films dans le panier, un par ligne. Terminez par Ctrl+Z (Windows) puis Entrée.", file=sys.stderr)
+        input_data = sys.stdin.read().strip()
 
-    input_data = sys.stdin.read().strip()
-    
     if not input_data:
         print(0)
         return
 
+    if stats is not None:
+        with stats.stage("parse"):
+            basket = InputParser.parse(input_data)
+        print(next(BatchPricer.price_baskets([(None, basket)], stats=stats)))
+        return
+
     basket = InputParser.parse(input_data)
 
     # Calculate total price
     total = PriceCalculator.calculate_total(basket)
 
     # Print total price
-    print(int(total) if total.is_integer() else total)
+    print(format_total(total))
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.serve:
+        # Imported here so that one-shot runs do not pay for asyncio
+        import asyncio
+        from src.cache import DEFAULT_MAXSIZE
+        from src.server import PricingServer
+        server = PricingServer(args.rules, DEFAULT_MAXSIZE if args.cache_size is None else args.cache_size)
+        print(f"Serveur de prix à l'écoute sur {args.serve}", file=sys.stderr)
+        try:
+            asyncio.run(server.serve(args.serve))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if not args.stats:
+        run(args)
+        return
+
+    stats = PipelineStats()
+    with stats.stage("total"):
+        run(args, stats)
+    stats.report(sys.stderr)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,3 +1,35 @@
-from .models import Movie
-from .calculator import PriceCalculator
-from .parser import InputParser
\ No newline at end of file
+from importlib import import_module
+
+# Public names and the module defining them. They are imported on first
+# access so that light entry points (python -m src.client) do not load the
+# catalog and the pricing engine.
+_EXPORTS = {
+    "Catalog": ".catalog",
+    "TitleInfo": ".catalog",
+    "Movie": ".models",
+    "PricingRules": ".rules",
+    "SagaRule": ".rules",
+    "get_rules": ".rules",
+    "set_rules": ".rules",
+    "load_rules": ".rules",
+    "PricingCache": ".cache",
+    "PriceCalculator": ".calculator",
+    "InputParser": ".parser",
+    "PipelineStats": ".stats",
+    "BatchPricer": ".batch",
+    "format_total": ".batch",
+    "Basket": ".basket",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,81 @@
+from typing import Dict, Iterable, List, Optional
+from .rules import BASIS_POINTS, PricingRules, get_rules
+
+# Basket class to reprice a live cart incrementally
+class Basket:
+    __slots__ = ("_rules", "_counts", "_saga_counts", "_saga_unique", "_saga_subtotals",
+                 "_nb_other", "_size", "_total_cents")
+
+    def __init__(self, titles: Iterable[str] = (), rules: Optional[PricingRules] = None):
+        """
+        Panier modifiable qui tient à jour ses compteurs par saga : add,
+        remove et total coûtent O(1) quelle que soit la taille du panier.
+        """
+        self._rules = rules or get_rules()
+        nb_sagas = len(self._rules.sagas)
+        # Keyed by normalized title: other movies all share one title id
+        self._counts: Dict[str, int] = {}
+        self._saga_counts: List[int] = [0] * nb_sagas
+        self._saga_unique: List[int] = [0] * nb_sagas
+        self._saga_subtotals: List[int] = [0] * nb_sagas
+        self._nb_other = 0
+        self._size = 0
+        self._total_cents = 0
+        for title in titles:
+            self.add(title)
+
+    def add(self, title: str) -> None:
+        info = self._rules.catalog.lookup(title)
+        count = self._counts.get(info.key, 0)
+        self._counts[info.key] = count + 1
+        self._update(info.title_id, 1, count == 0)
+
+    def remove(self, title: str) -> None:
+        """
+        Retire un exemplaire du titre. Lève KeyError s'il n'est pas dans le panier.
+        """
+        info = self._rules.catalog.lookup(title)
+        count = self._counts.get(info.key, 0)
+        if count == 0:
+            raise KeyError(title)
+
+        if count == 1:
+            del self._counts[info.key]
+        else:
+            self._counts[info.key] = count - 1
+        self._update(info.title_id, -1, count == 1)
+
+    def _update(self, title_id: int, delta: int, unique_changed: bool) -> None:
+        self._size += delta
+        saga_index = self._rules.catalog.saga_indexes[title_id]
+        if saga_index < 0:
+            self._nb_other += delta
+            self._total_cents += delta * self._rules.other_unit_price_cents
+            return
+
+        self._saga_counts[saga_index] += delta
+        if unique_changed:
+            self._saga_unique[saga_index] += delta
+
+        subtotal = self._rules.sagas[saga_index].subtotal_cents(self._saga_counts[saga_index],
+                                                                 self._saga_unique[saga_index])
+        self._total_cents += subtotal - self._saga_subtotals[saga_index]
+        self._saga_subtotals[saga_index] = subtotal
+
+    def total(self) -> float:
+        return self._total_cents / 100
+
+    def total_cents(self) -> int:
+        return self._total_cents
+
+    def discount_rate(self, saga_index: int = 0) -> float:
+        """
+        Taux de réduction courant d'une saga (BTTF par défaut).
+        """
+        return self._rules.sagas[saga_index].discount(self._saga_unique[saga_index]) / BASIS_POINTS
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, title: str) -> bool:
+        return self._rules.catalog.lookup(title).key in self._counts
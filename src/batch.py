@@ -0,0 +1,107 @@
+import time
+from typing import Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+from .calculator import PriceCalculator
+from .cache import PricingCache
+from .models import Movie
+from .rules import get_rules
+from .stats import PipelineStats
+
+# Number of output lines accumulated before each write
+DEFAULT_BUFFER_LINES = 4096
+
+def format_total(total: float) -> str:
+    """
+    Formate un total comme le fait la sortie standard : entier si possible.
+    """
+    return str(int(total)) if total.is_integer() else str(total)
+
+# BatchPricer class to price a stream of baskets one after another
+class BatchPricer:
+    @staticmethod
+    def price_baskets(baskets: Iterable[Tuple[Optional[str], List[Movie]]],
+                      cache: Optional[PricingCache] = None,
+                      stats: Optional[PipelineStats] = None) -> Iterator[str]:
+        """
+        Calcule le total de chaque panier dès qu'il est disponible et produit
+        la ligne de sortie correspondante ("<total>" ou "<id>\\t<total>").
+        Avec cache, les paniers identiques ne sont calculés qu'une fois.
+        Avec stats, les étapes classify et price sont chronométrées.
+        """
+        if stats is not None:
+            yield from BatchPricer._price_baskets_with_stats(baskets, cache, stats)
+            return
+
+        for basket_id, movies in baskets:
+            total = format_total(PriceCalculator.calculate_total(movies, cache))
+            yield total if basket_id is None else f"{basket_id}\t{total}"
+
+    @staticmethod
+    def price_id_baskets(baskets: Iterable[Tuple[Optional[str], Sequence[int]]],
+                         cache: Optional[PricingCache] = None,
+                         stats: Optional[PipelineStats] = None) -> Iterator[str]:
+        """
+        Comme price_baskets, pour des paniers donnés par identifiants de
+        titre (voir InputParser.iter_file_ids).
+        """
+        perf_counter = time.perf_counter
+        for basket_id, title_ids in baskets:
+            if stats is None:
+                total = format_total(PriceCalculator.calculate_total_ids(title_ids, cache))
+            else:
+                start = perf_counter()
+                total = format_total(PriceCalculator.calculate_total_ids(title_ids, cache))
+                stats.add_time("price", perf_counter() - start)
+                stats.count("baskets")
+                stats.count("movies", len(title_ids))
+            yield total if basket_id is None else f"{basket_id}\t{total}"
+
+    @staticmethod
+    def _price_baskets_with_stats(baskets: Iterable[Tuple[Optional[str], List[Movie]]],
+                                  cache: Optional[PricingCache], stats: PipelineStats) -> Iterator[str]:
+        rules = get_rules()
+        title_id = rules.catalog.title_id
+        perf_counter = time.perf_counter
+        for basket_id, movies in baskets:
+            start = perf_counter()
+            # Cache hits skip classification, their time is counted in price
+            key = tuple(sorted([m.title for m in movies])) if cache is not None else None
+            cents = cache.lookup(key, rules) if cache is not None else None
+            if cents is None:
+                title_ids = [title_id(m.title) for m in movies]
+                classified = perf_counter()
+                stats.add_time("classify", classified - start)
+                cents = PriceCalculator.calculate_total_cents(title_ids, None, rules)
+                if cache is not None:
+                    cache.store(key, cents)
+                start = classified
+            stats.add_time("price", perf_counter() - start)
+            stats.count("baskets")
+            stats.count("movies", len(movies))
+            total = format_total(cents / 100)
+            yield total if basket_id is None else f"{basket_id}\t{total}"
+
+    @staticmethod
+    def write_buffered(lines: Iterable[str], out: TextIO, buffer_lines: int = DEFAULT_BUFFER_LINES) -> int:
+        """
+        Écrit les lignes par blocs de buffer_lines et vide le flux après
+        chaque bloc. Retourne le nombre de lignes écrites.
+        """
+        if buffer_lines < 1:
+            raise ValueError("buffer_lines doit être supérieur ou égal à 1")
+
+        chunk: List[str] = []
+        count = 0
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= buffer_lines:
+                out.write("\n".join(chunk) + "\n")
+                out.flush()
+                count += len(chunk)
+                chunk = []
+
+        if chunk:
+            out.write("\n".join(chunk) + "\n")
+            out.flush()
+            count += len(chunk)
+
+        return count
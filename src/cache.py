@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+from .rules import PricingRules
+
+# Maximum number of baskets kept in the pricing cache
+DEFAULT_MAXSIZE = 4096
+
+# PricingCache class to memoize basket totals
+class PricingCache:
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Cache LRU borné des totaux en centimes, indexé par le contenu du
+        panier à l'ordre près (tuple trié des titres bruts ou des
+        identifiants) : la clé est connue avant la classification des
+        titres, qu'un succès évite donc en plus du calcul du prix.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize doit être supérieur ou égal à 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._totals: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._rules: Optional[PricingRules] = None
+
+    def lookup(self, key: Hashable, rules: PricingRules) -> Optional[int]:
+        """
+        Retourne le total en centimes mémorisé pour key, ou None. Le cache
+        est vidé dès que les règles changent (les identifiants de titre
+        dépendent du catalogue des règles).
+        """
+        if rules is not self._rules:
+            self._totals.clear()
+            self._rules = rules
+
+        total = self._totals.get(key)
+        if total is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._totals.move_to_end(key)
+        return total
+
+    def store(self, key: Hashable, total: int) -> int:
+        self._totals[key] = total
+        if len(self._totals) > self.maxsize:
+            self._totals.popitem(last=False)
+        return total
+
+    def clear(self) -> None:
+        self._totals.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._totals)
@@ -1,33 +1,81 @@
-from typing import List
-from .models import Movie, BTTF_UNIT_PRICE, OTHER_UNIT_PRICE, DISCOUNT_RATES
+from typing import List, Optional, Sequence
+from .models import Movie
+from .cache import PricingCache
+from .rules import BASIS_POINTS, PricingRules, get_rules
 
 # PriceCalculator class to calculate the total price of movies
 class PriceCalculator:
     @staticmethod
-    def calculate_total(movies: List[Movie]) -> float:
-        bttf_movies = [m for m in movies if m.is_bttf]
-        other_movies = [m for m in movies if not m.is_bttf]
-        bttf_total = PriceCalculator._calculate_bttf_subtotal(bttf_movies)
-        
-        others_total = len(other_movies) * OTHER_UNIT_PRICE
+    def calculate_total(movies: List[Movie], cache: Optional[PricingCache] = None,
+                        rules: Optional[PricingRules] = None) -> float:
+        if cache is not None:
+            return PriceCalculator.calculate_total_titles([m.title for m in movies], cache, rules)
 
-    
-        return bttf_total + others_total
+        rules = rules or get_rules()
+        catalog = rules.catalog
+        known = catalog.known_ids
+        try:
+            title_ids = [known[m.title] for m in movies]
+        except KeyError:
+            title_id = catalog.title_id
+            title_ids = [title_id(m.title) for m in movies]
+        return rules.price_signature(rules.signature(title_ids)) / 100
 
     @staticmethod
-    def _calculate_bttf_subtotal(movies: List[Movie]) -> float:
-        if not movies:
-            return 0.0
-
-        unique_titles = {m.title for m in movies}
-        nb_unique = len(unique_titles)
-
-        applicable_discount = 0.0
-        for threshold in sorted(DISCOUNT_RATES.keys(), reverse=True):
-            if nb_unique >= threshold:
-                applicable_discount = DISCOUNT_RATES[threshold]
-                break
-
-        base_price = len(movies) * BTTF_UNIT_PRICE
-        return base_price * (1 - applicable_discount)
-    
\ No newline at end of file
+    def calculate_total_titles(titles: Sequence[str], cache: Optional[PricingCache] = None,
+                               rules: Optional[PricingRules] = None) -> float:
+        """
+        Calcule le total d'un panier donné par ses titres bruts. Avec cache,
+        le total est mémorisé par multiensemble de titres (tuple trié) : un
+        succès évite aussi la classification des titres.
+        """
+        rules = rules or get_rules()
+        if cache is not None:
+            key = tuple(sorted(titles))
+            total = cache.lookup(key, rules)
+            if total is not None:
+                return total / 100
+
+        catalog = rules.catalog
+        known = catalog.known_ids
+        try:
+            title_ids = [known[t] for t in titles]
+        except KeyError:
+            title_id = catalog.title_id
+            title_ids = [title_id(t) for t in titles]
+        total = rules.price_signature(rules.signature(title_ids))
+        if cache is not None:
+            cache.store(key, total)
+        return total / 100
+
+    @staticmethod
+    def calculate_total_ids(title_ids: Sequence[int], cache: Optional[PricingCache] = None,
+                            rules: Optional[PricingRules] = None) -> float:
+        """
+        Calcule le total d'un panier donné par les identifiants de titre
+        du catalogue des règles. Avec cache, le total est mémorisé par
+        tuple trié d'identifiants.
+        """
+        return PriceCalculator.calculate_total_cents(title_ids, cache, rules) / 100
+
+    @staticmethod
+    def calculate_total_cents(title_ids: Sequence[int], cache: Optional[PricingCache] = None,
+                              rules: Optional[PricingRules] = None) -> int:
+        rules = rules or get_rules()
+        if cache is None:
+            return rules.price_signature(rules.signature(title_ids))
+
+        key = tuple(sorted(title_ids))
+        total = cache.lookup(key, rules)
+        if total is None:
+            total = cache.store(key, rules.price_signature(rules.signature(title_ids)))
+        return total
+
+    @staticmethod
+    def discount_rate(nb_unique: int, saga_index: int = 0, rules: Optional[PricingRules] = None) -> float:
+        """
+        Retourne le taux de réduction d'une saga (BTTF par défaut) pour
+        nb_unique volets différents.
+        """
+        rules = rules or get_rules()
+        return rules.sagas[saga_index].discount(nb_unique) / BASIS_POINTS
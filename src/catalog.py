@@ -0,0 +1,153 @@
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# Maximum number of raw titles kept in the lookup cache
+DEFAULT_CACHE_SIZE = 65536
+
+# Every movie outside the sagas shares this id, only saga titles are interned
+OTHER_TITLE_ID = 0
+
+# Maximum number of distinct saga titles interned by a catalog
+MAX_SAGA_TITLES = 100_000
+
+ROMAN_NUMERALS = {"i": "1", "ii": "2", "iii": "3", "iv": "4", "v": "5", "vi": "6"}
+
+@dataclass(frozen=True)
+class TitleInfo:
+    title_id: int
+    key: str
+    title: str
+    saga: Optional[str]
+    volume: Optional[int]
+    unit_price: float
+
+    @property
+    def is_saga(self) -> bool:
+        return self.saga is not None
+
+# Catalog class to intern titles and cache their classification
+class Catalog:
+    def __init__(self, sagas: Dict[str, float], other_unit_price: float,
+                 aliases: Optional[Dict[str, str]] = None, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        sagas associe le nom de chaque saga à son prix unitaire, aliases
+        associe une abréviation (ex. "BTTF") au nom complet de la saga.
+        L'ordre de sagas donne l'index de saga de chaque titre.
+        """
+        self.other_unit_price = other_unit_price
+        self._aliases = {alias.casefold(): name.casefold().split() for alias, name in (aliases or {}).items()}
+        self._sagas = {Catalog._normalize_words(name.casefold().split()): (index, name, price)
+                       for index, (name, price) in enumerate(sagas.items())}
+
+        self._ids: Dict[str, int] = {}
+        # Entry OTHER_TITLE_ID stands for all the other movies, so that the
+        # tables below only grow with the (bounded) number of saga titles
+        self.entries: List[TitleInfo] = [TitleInfo(OTHER_TITLE_ID, "", "", None, None, other_unit_price)]
+        # saga_flags[title_id] is True for saga titles and saga_indexes[title_id]
+        # is the saga's index (-1 for other movies), kept in step with entries
+        self.saga_flags: List[bool] = [False]
+        self.saga_indexes: List[int] = [-1]
+
+        # Plain raw title -> id dict checked before the LRU cache (one dict
+        # lookup instead of a wrapper call per movie), cleared when full
+        self.known_ids: Dict[str, int] = {}
+        self._known_size = cache_size
+        self._lookup = lru_cache(maxsize=cache_size)(self._resolve)
+        self._lookup_bytes = lru_cache(maxsize=cache_size)(self._resolve_bytes)
+
+    def update_prices(self, sagas: Dict[str, float], other_unit_price: float) -> None:
+        """
+        Met à jour les prix unitaires des fiches sans changer les
+        identifiants. sagas doit nommer les mêmes sagas que le constructeur.
+        """
+        self.other_unit_price = other_unit_price
+        self._sagas = {key: (index, name, sagas[name]) for key, (index, name, _) in self._sagas.items()}
+        self.entries = [replace(info, unit_price=sagas[info.saga] if info.is_saga else other_unit_price)
+                        for info in self.entries]
+        # Cached fiches of other movies carry the old price; ids (known_ids) are unchanged
+        self._lookup.cache_clear()
+
+    def normalize(self, raw_title: str) -> str:
+        """
+        Normalise un titre : casse, espaces superflus, abréviations et
+        numéros de volume en chiffres romains ("BTTF II" -> "back to the future 2").
+        """
+        words: List[str] = []
+        for word in raw_title.casefold().split():
+            words.extend(self._aliases.get(word, (word,)))
+        return Catalog._normalize_words(words)
+
+    def lookup(self, raw_title: str) -> TitleInfo:
+        """
+        Retourne la fiche du titre. Les titres de saga sont indexés au premier
+        passage, les autres films partagent l'identifiant OTHER_TITLE_ID.
+        """
+        return self._lookup(raw_title)
+
+    def title_id(self, raw_title: str) -> int:
+        title_id = self.known_ids.get(raw_title)
+        if title_id is None:
+            title_id = self._lookup(raw_title).title_id
+            if len(self.known_ids) >= self._known_size:
+                self.known_ids.clear()
+            self.known_ids[raw_title] = title_id
+        return title_id
+
+    def title_id_bytes(self, raw_title: bytes) -> int:
+        """
+        Comme title_id, mais à partir d'une ligne UTF-8 brute : seuls les
+        titres absents du cache sont décodés. Retourne -1 pour une ligne vide.
+        """
+        return self._lookup_bytes(raw_title)
+
+    def __getitem__(self, title_id: int) -> TitleInfo:
+        return self.entries[title_id]
+
+    def __len__(self) -> int:
+        """
+        Nombre de titres de saga indexés.
+        """
+        return len(self.entries) - 1
+
+    def _resolve(self, raw_title: str) -> TitleInfo:
+        key = self.normalize(raw_title)
+        title_id = self._ids.get(key)
+        if title_id is not None:
+            return self.entries[title_id]
+
+        saga_index, saga, volume, unit_price = self._classify(key)
+        if saga_index < 0:
+            return TitleInfo(OTHER_TITLE_ID, key, raw_title.strip(), None, None, unit_price)
+        if len(self.entries) > MAX_SAGA_TITLES:
+            raise ValueError(f"Plus de {MAX_SAGA_TITLES} titres de saga différents")
+
+        info = TitleInfo(len(self.entries), key, raw_title.strip(), saga, volume, unit_price)
+        self._ids[key] = info.title_id
+        self.entries.append(info)
+        self.saga_flags.append(info.is_saga)
+        self.saga_indexes.append(saga_index)
+        return info
+
+    def _resolve_bytes(self, raw_title: bytes) -> int:
+        title = raw_title.decode("utf-8").strip()
+        if not title:
+            return -1
+        return self._lookup(title).title_id
+
+    def _classify(self, key: str):
+        for saga_key, (index, name, price) in self._sagas.items():
+            if saga_key in key:
+                last_word = key.rsplit(" ", 1)[-1]
+                volume = int(last_word) if last_word.isdigit() else None
+                return index, name, volume, price
+        return -1, None, None, self.other_unit_price
+
+    @staticmethod
+    def _normalize_words(words: List[str]) -> str:
+        if len(words) > 1 and words[-1] in ROMAN_NUMERALS:
+            words = words[:-1] + [ROMAN_NUMERALS[words[-1]]]
+        # "part 2" and "2" designate the same volume
+        if len(words) > 2 and words[-2] == "part" and words[-1].isdigit():
+            words = words[:-2] + [words[-1]]
+        return " ".join(words)
@@ -0,0 +1,101 @@
+import json
+import socket
+import sys
+from typing import Iterable, List, Sequence, Tuple, Union
+
+# Number of requests sent before reading their responses when pipelining
+DEFAULT_WINDOW = 256
+
+Address = Tuple[str, Union[str, Tuple[str, int]]]
+
+def parse_address(address: str) -> Address:
+    """
+    "hôte:port" désigne une adresse TCP, tout autre valeur le chemin
+    d'une socket Unix.
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return "tcp", (host or "127.0.0.1", int(port))
+    return "unix", address
+
+# PricingClient class to query a running pricing server
+class PricingClient:
+    def __init__(self, address: str, timeout: float = 5.0):
+        family, target = parse_address(address)
+        if family == "tcp":
+            self._sock = socket.create_connection(target, timeout=timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(target)
+        self._reader = self._sock.makefile("rb")
+
+    def price(self, titles: Sequence[str]) -> float:
+        return self.price_many([titles])[0]
+
+    def price_many(self, baskets: Iterable[Sequence[str]], window: int = DEFAULT_WINDOW) -> List[float]:
+        """
+        Envoie les paniers en pipeline sur la connexion, par fenêtres de
+        window requêtes, et retourne les totaux dans l'ordre.
+        """
+        totals: List[float] = []
+        batch: List[bytes] = []
+        for titles in baskets:
+            batch.append(json.dumps(list(titles)).encode("utf-8") + b"\n")
+            if len(batch) >= window:
+                totals.extend(self._exchange(batch))
+                batch = []
+        if batch:
+            totals.extend(self._exchange(batch))
+        return totals
+
+    def _exchange(self, requests: List[bytes]) -> List[float]:
+        """
+        Envoie une fenêtre de requêtes et lit toutes ses réponses avant de
+        lever ValueError sur la première erreur, pour que la connexion
+        reste synchronisée et réutilisable.
+        """
+        self._sock.sendall(b"".join(requests))
+        totals = []
+        error = None
+        for _ in requests:
+            line = self._reader.readline()
+            if not line:
+                raise ConnectionError("Connexion fermée par le serveur")
+            response = line.decode("utf-8").strip()
+            if response.startswith("ERR"):
+                error = error or response[3:].strip()
+            elif error is None:
+                totals.append(float(response))
+        if error is not None:
+            raise ValueError(error)
+        return totals
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self) -> "PricingClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def main(argv=None):
+    """
+    Client en ligne de commande : lit un panier (un titre par ligne) sur
+    stdin et affiche son total calculé par le serveur.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Usage : python -m src.client <hôte:port | socket>", file=sys.stderr)
+        sys.exit(2)
+
+    titles = [line.strip() for line in sys.stdin if line.strip()]
+    with PricingClient(argv[0]) as client:
+        total = client.price(titles)
+    print(int(total) if total.is_integer() else total)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from .catalog import Catalog
 
 # Define constants for the BTTF saga and other movies
 BTTF_SAGA_NAME = "Back to the Future"
@@ -11,10 +12,22 @@ DISCOUNT_RATES = {
     1: 0.00
 }
 
+# Abbreviations accepted in the input for each saga
+TITLE_ALIASES = {
+    "BTTF": BTTF_SAGA_NAME
+}
+
+# Shared title catalog used by the parser and the calculator
+CATALOG = Catalog({BTTF_SAGA_NAME: BTTF_UNIT_PRICE}, OTHER_UNIT_PRICE, TITLE_ALIASES)
+
 @dataclass(frozen=True)
 class Movie:
     title: str
 
+    @property
+    def title_id(self) -> int:
+        return CATALOG.title_id(self.title)
+
     @property
     def is_bttf(self) -> bool:
-        return BTTF_SAGA_NAME in self.title
\ No newline at end of file
+        return CATALOG.lookup(self.title).is_saga
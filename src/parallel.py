@@ -0,0 +1,107 @@
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, Optional, TextIO, Tuple
+from .batch import BatchPricer
+from .parser import InputParser, BASKET_ID_SEPARATOR
+from .rules import load_rules
+
+# Default size of the byte ranges handed to each worker
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# ParallelRepricer class to price a basket file with a process pool
+class ParallelRepricer:
+    @staticmethod
+    def iter_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, with_ids: bool = False) -> Iterator[Tuple[int, int]]:
+        """
+        Découpe le fichier en plages d'octets (début, fin) d'environ
+        chunk_size octets, alignées sur les frontières de paniers : une
+        ligne vide, ou un changement d'identifiant avec with_ids.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size doit être supérieur ou égal à 1")
+
+        file_size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            start = 0
+            while start < file_size:
+                end = ParallelRepricer._next_boundary(f, start + chunk_size, file_size, with_ids)
+                yield start, end
+                start = end
+
+    @staticmethod
+    def reprice_file(path: str, out: TextIO, workers: Optional[int] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, with_ids: bool = False,
+                     rules_path: Optional[str] = None) -> int:
+        """
+        Calcule les totaux du fichier dans un pool de processus et les écrit
+        dans l'ordre d'entrée. La sortie est identique à celle du mode batch
+        mono-processus. Avec rules_path, chaque processus charge ce fichier
+        de promotions. Retourne le nombre de paniers.
+        """
+        workers = workers or os.cpu_count() or 1
+        chunks = ParallelRepricer.iter_chunks(path, chunk_size, with_ids)
+        count = 0
+
+        initializer, initargs = (load_rules, (rules_path,)) if rules_path else (None, ())
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+            # Only a bounded window of chunks is in flight so the parent's memory stays flat
+            pending = deque()
+            for start, end in chunks:
+                pending.append(executor.submit(_price_chunk, path, start, end, with_ids))
+                if len(pending) >= 2 * workers:
+                    count += ParallelRepricer._write_result(pending.popleft().result(), out)
+
+            while pending:
+                count += ParallelRepricer._write_result(pending.popleft().result(), out)
+
+        return count
+
+    @staticmethod
+    def _write_result(result: Tuple[str, int], out: TextIO) -> int:
+        text, count = result
+        if text:
+            out.write(text)
+            out.flush()
+        return count
+
+    @staticmethod
+    def _next_boundary(f: BinaryIO, target: int, file_size: int, with_ids: bool) -> int:
+        if target >= file_size:
+            return file_size
+
+        f.seek(target)
+        # Finish the line the target falls in, it belongs to the current chunk
+        f.readline()
+
+        if not with_ids:
+            while True:
+                line = f.readline()
+                if not line:
+                    return file_size
+                if not line.decode("utf-8").strip():
+                    return f.tell()
+
+        current_id = None
+        while True:
+            position = f.tell()
+            line = f.readline()
+            if not line:
+                return file_size
+            # Decoded like the str parser, which also skips non-ASCII blank and tab-only lines
+            if not line.decode("utf-8").strip():
+                continue
+            basket_id = line.partition(BASKET_ID_SEPARATOR.encode())[0].decode("utf-8").strip()
+            if current_id is not None and basket_id != current_id:
+                return position
+            current_id = basket_id
+
+def _price_chunk(path: str, start: int, end: int, with_ids: bool) -> Tuple[str, int]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+    totals = list(BatchPricer.price_baskets(InputParser.iter_baskets(lines, with_ids=with_ids)))
+    return "".join(line + "\n" for line in totals), len(totals)
@@ -1,5 +1,18 @@
-from typing import List
+import mmap
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from .models import Movie
+from .catalog import Catalog, DEFAULT_CACHE_SIZE
+from .rules import get_rules
+
+# Separator between the basket id and the title in id-column mode
+BASKET_ID_SEPARATOR = "\t"
+
+# Bytes split into lines at once when scanning a buffer
+BLOCK_BYTES = 1024 * 1024
+
+# Bytes of a memory-mapped file scanned before its pages are released
+RELEASE_BYTES = 4 * 1024 * 1024
 
 # InputParser class to parse the input text
 class InputParser:
@@ -13,5 +26,166 @@ class InputParser:
             return []
 
         lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-        
-        return [Movie(title=line) for line in lines]
\ No newline at end of file
+
+        return [Movie(title=line) for line in lines]
+
+    @staticmethod
+    def parse_ids(raw_text: str, catalog: Optional[Catalog] = None) -> List[int]:
+        """
+        Comme parse, mais retourne directement les identifiants de titre
+        du catalogue (celui des règles actives par défaut).
+        """
+        if not raw_text:
+            return []
+
+        title_id = (catalog if catalog is not None else get_rules().catalog).title_id
+        return [title_id(line) for line in raw_text.split('\n') if line.strip()]
+
+    @staticmethod
+    def iter_baskets(lines: Iterable[str], with_ids: bool = False) -> Iterator[Tuple[Optional[str], List[Movie]]]:
+        """
+        Lit les lignes une à une et produit les paniers au fur et à mesure,
+        sous forme de couples (identifiant, films).
+
+        Par défaut, les paniers sont séparés par une ligne vide et n'ont pas
+        d'identifiant. Avec with_ids, chaque ligne est de la forme
+        "<id>\\t<titre>" et les lignes consécutives de même id forment un panier.
+        Seul le panier en cours est gardé en mémoire.
+        """
+        if with_ids:
+            yield from InputParser._iter_id_baskets(lines)
+            return
+
+        basket: List[Movie] = []
+        for line in lines:
+            title = line.strip()
+            if title:
+                basket.append(Movie(title=title))
+            elif basket:
+                yield None, basket
+                basket = []
+
+        if basket:
+            yield None, basket
+
+    @staticmethod
+    def _iter_id_baskets(lines: Iterable[str]) -> Iterator[Tuple[Optional[str], List[Movie]]]:
+        current_id: Optional[str] = None
+        basket: List[Movie] = []
+        for line in lines:
+            if not line.strip():
+                continue
+
+            basket_id, sep, title = line.partition(BASKET_ID_SEPARATOR)
+            if not sep:
+                raise ValueError(f"Ligne sans identifiant de panier : {line.rstrip()!r}")
+            basket_id = basket_id.strip()
+            title = title.strip()
+
+            if basket and basket_id != current_id:
+                yield current_id, basket
+                basket = []
+            current_id = basket_id
+            if title:
+                basket.append(Movie(title=title))
+
+        if basket:
+            yield current_id, basket
+
+    @staticmethod
+    def iter_file_ids(path: str, with_ids: bool = False,
+                      catalog: Optional[Catalog] = None) -> Iterator[Tuple[Optional[str], array]]:
+        """
+        Comme iter_baskets, mais lit le fichier par projection mémoire (mmap)
+        sans le décoder : chaque panier est un tableau compact d'identifiants
+        de titre. La mémoire utilisée reste constante quelle que soit la
+        taille du fichier.
+        """
+        with open(path, "rb") as f:
+            if not f.seek(0, 2):
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from InputParser.iter_buffer_ids(mm, with_ids=with_ids, catalog=catalog)
+
+    @staticmethod
+    def iter_buffer_ids(buffer: Union[bytes, mmap.mmap], start: int = 0, end: Optional[int] = None,
+                        with_ids: bool = False, catalog: Optional[Catalog] = None) -> Iterator[Tuple[Optional[str], array]]:
+        """
+        Parcourt les octets buffer[start:end] par blocs alignés sur les fins
+        de ligne et produit les paniers (identifiant, tableau d'identifiants
+        de titre). Les titres sont recherchés directement à partir des octets.
+        """
+        # Not "catalog or ...": an empty Catalog is falsy
+        catalog = catalog if catalog is not None else get_rules().catalog
+        end = len(buffer) if end is None else end
+        # Pages already scanned are handed back to the OS so the RSS stays flat
+        release = isinstance(buffer, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED")
+        released = start - start % mmap.PAGESIZE
+
+        # Local bytes -> id table in front of the catalog's LRU, cleared when full
+        known: Dict[bytes, int] = {}
+
+        def title_id(line: bytes) -> int:
+            tid = known.get(line)
+            if tid is None:
+                if len(known) >= DEFAULT_CACHE_SIZE:
+                    known.clear()
+                tid = known[line] = catalog.title_id_bytes(line)
+            return tid
+
+        basket = array("l")
+        current_id: Optional[bytes] = None
+        separator = BASKET_ID_SEPARATOR.encode()
+        position = start
+        while position < end:
+            stop = min(position + BLOCK_BYTES, end)
+            if stop < end:
+                newline = buffer.rfind(b"\n", position, stop)
+                if newline < 0:
+                    newline = buffer.find(b"\n", stop, end)
+                stop = end if newline < 0 else newline + 1
+            lines = buffer[position:stop].split(b"\n")
+            if stop < end or not lines[-1]:
+                # Drop the empty piece after the block's final newline
+                lines.pop()
+            position = stop
+
+            if release and position - released >= RELEASE_BYTES:
+                length = (position - released) - (position - released) % mmap.PAGESIZE
+                buffer.madvise(mmap.MADV_DONTNEED, released, length)
+                released += length
+
+            if not with_ids:
+                for line in lines:
+                    tid = known.get(line)
+                    if tid is None:
+                        tid = -1 if not line or line.isspace() else title_id(line)
+                    if tid >= 0:
+                        basket.append(tid)
+                    elif basket:
+                        yield None, basket
+                        basket = array("l")
+                continue
+
+            for line in lines:
+                basket_id, sep, title = line.partition(separator)
+                if not sep:
+                    # Decoded rather than looked up, so that a malformed line is never cached
+                    if not line.decode("utf-8").strip():
+                        continue
+                    raise ValueError(f"Ligne sans identifiant de panier : {line.decode('utf-8').rstrip()!r}")
+                basket_id = basket_id.strip()
+                tid = title_id(title)
+                # Blank lines holding a tab are skipped too; only decoded when the title is blank
+                if tid < 0 and not basket_id.decode("utf-8").strip():
+                    continue
+
+                if basket and basket_id != current_id:
+                    yield current_id.decode("utf-8"), basket
+                    basket = array("l")
+                current_id = basket_id
+                if tid >= 0:
+                    basket.append(tid)
+
+        if basket:
+            yield (None if not with_ids else current_id.decode("utf-8")), basket
@@ -0,0 +1,203 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from . import models
+from .catalog import Catalog
+
+# Discounts are stored in basis points: 10000 means 100% off
+BASIS_POINTS = 10000
+
+# Highest "N distinct volumes" threshold accepted, tiers are stored densely up to it
+MAX_THRESHOLD = 1000
+
+# Basket signature: (other count, (saga index, count, distinct volumes), ...)
+Signature = Tuple[Any, ...]
+
+def to_cents(amount: float) -> int:
+    return int(round(amount * 100))
+
+def to_basis_points(rate: float) -> int:
+    return int(round(rate * BASIS_POINTS))
+
+def models_fingerprint() -> tuple:
+    """
+    Résume les règles définies dans models : tout changement de
+    BTTF_UNIT_PRICE, OTHER_UNIT_PRICE ou DISCOUNT_RATES change l'empreinte.
+    """
+    return models.BTTF_UNIT_PRICE, models.OTHER_UNIT_PRICE, dict(models.DISCOUNT_RATES)
+
+@dataclass(frozen=True)
+class SagaRule:
+    name: str
+    unit_price_cents: int
+    # tiers[n] is the discount for n distinct volumes, the last one applies beyond
+    tiers: Tuple[int, ...]
+    aliases: Tuple[str, ...] = ()
+
+    @staticmethod
+    def compile(name: str, unit_price: float, discounts: Dict[int, float], aliases: Iterable[str] = ()) -> "SagaRule":
+        """
+        Compile les seuils "N volets différents -> X% de réduction" en un
+        tableau dense indexé par le nombre de volets différents. Lève
+        ValueError pour un seuil hors de [0, MAX_THRESHOLD], un taux hors de
+        [0, 1] ou un prix négatif.
+        """
+        if not isinstance(discounts, Mapping):
+            raise ValueError(f"Les réductions de la saga {name!r} doivent être un dictionnaire")
+        if not 0 <= unit_price < float("inf"):
+            raise ValueError(f"Prix unitaire négatif ou infini pour la saga {name!r}")
+        for threshold, rate in discounts.items():
+            if not isinstance(threshold, int) or not 0 <= threshold <= MAX_THRESHOLD:
+                raise ValueError(f"Seuil {threshold!r} hors de [0, {MAX_THRESHOLD}] pour la saga {name!r}")
+            if not 0 <= rate <= 1:
+                raise ValueError(f"Réduction hors de [0, 1] pour la saga {name!r}")
+
+        tiers: List[int] = []
+        discount = 0
+        for nb_unique in range(max(discounts, default=0) + 1):
+            if nb_unique in discounts:
+                discount = to_basis_points(discounts[nb_unique])
+            tiers.append(discount)
+        return SagaRule(name, to_cents(unit_price), tuple(tiers), tuple(aliases))
+
+    def discount(self, nb_unique: int) -> int:
+        tiers = self.tiers
+        return tiers[nb_unique] if nb_unique < len(tiers) else tiers[-1]
+
+    def subtotal_cents(self, nb_movies: int, nb_unique: int) -> int:
+        base_price = nb_movies * self.unit_price_cents
+        # Rounded half up to the nearest cent
+        return (base_price * (BASIS_POINTS - self.discount(nb_unique)) + BASIS_POINTS // 2) // BASIS_POINTS
+
+# PricingRules class holding the compiled promotions of every saga
+class PricingRules:
+    def __init__(self, sagas: Sequence[SagaRule], other_unit_price_cents: int, catalog: Optional[Catalog] = None):
+        self.sagas = tuple(sagas)
+        self.other_unit_price_cents = other_unit_price_cents
+        if catalog is None:
+            aliases = {alias: saga.name for saga in self.sagas for alias in saga.aliases}
+            catalog = Catalog({saga.name: saga.unit_price_cents / 100 for saga in self.sagas},
+                              other_unit_price_cents / 100, aliases)
+        self.catalog = catalog
+
+    @staticmethod
+    def from_models() -> "PricingRules":
+        """
+        Règles par défaut, construites à partir des constantes de models.
+        """
+        saga = SagaRule.compile(models.BTTF_SAGA_NAME, models.BTTF_UNIT_PRICE, models.DISCOUNT_RATES,
+                                [alias for alias, name in models.TITLE_ALIASES.items() if name == models.BTTF_SAGA_NAME])
+        # The shared catalog keeps its ids, only its price data follows models
+        models.CATALOG.update_prices({models.BTTF_SAGA_NAME: models.BTTF_UNIT_PRICE}, models.OTHER_UNIT_PRICE)
+        return PricingRules([saga], to_cents(models.OTHER_UNIT_PRICE), models.CATALOG)
+
+    @staticmethod
+    def from_config(config: Dict[str, Any]) -> "PricingRules":
+        """
+        Construit les règles depuis un dictionnaire de la forme :
+        {"other_unit_price": 20.0, "sagas": [{"name": ..., "unit_price": ...,
+        "discounts": {"2": 0.10, "3": 0.20}, "aliases": [...]}]}
+        """
+        try:
+            if not isinstance(config, Mapping) or not isinstance(config.get("sagas", []), list):
+                raise ValueError("la configuration doit être un dictionnaire avec une liste de sagas")
+
+            sagas = []
+            for saga in config.get("sagas", []):
+                discounts = saga.get("discounts", {})
+                if not isinstance(discounts, Mapping):
+                    raise ValueError(f"les réductions de la saga {saga.get('name')!r} doivent être un dictionnaire")
+                aliases = saga.get("aliases", [])
+                if not isinstance(aliases, list) or not all(isinstance(alias, str) for alias in aliases):
+                    raise ValueError(f"les alias de la saga {saga.get('name')!r} doivent être une liste de titres")
+                sagas.append(SagaRule.compile(
+                    str(saga["name"]),
+                    float(saga["unit_price"]),
+                    {int(threshold): float(rate) for threshold, rate in discounts.items()},
+                    aliases,
+                ))
+
+            other_unit_price = float(config["other_unit_price"])
+            if not 0 <= other_unit_price < float("inf"):
+                raise ValueError("le prix des autres films doit être fini et positif ou nul")
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Configuration de promotions invalide : {exc}") from exc
+
+        return PricingRules(sagas, to_cents(other_unit_price))
+
+    @staticmethod
+    def from_file(path: str) -> "PricingRules":
+        with open(path, encoding="utf-8") as f:
+            return PricingRules.from_config(json.load(f))
+
+    def signature(self, title_ids: Sequence[int]) -> Signature:
+        """
+        Signature canonique d'un panier, qui détermine entièrement son prix.
+        Coût O(nombre de films), quel que soit le nombre de sagas configurées.
+        """
+        # Only saga titles are interned, every other movie has OTHER_TITLE_ID (0)
+        saga_ids = [t for t in title_ids if t]
+        nb_other = len(title_ids) - len(saga_ids)
+        if not saga_ids:
+            return (nb_other,)
+        if len(self.sagas) == 1:
+            return (nb_other, (0, len(saga_ids), len(set(saga_ids))))
+
+        saga_indexes = self.catalog.saga_indexes
+        counts: Dict[int, int] = {}
+        for t in saga_ids:
+            s = saga_indexes[t]
+            counts[s] = counts.get(s, 0) + 1
+
+        distinct: Dict[int, int] = {}
+        for t in set(saga_ids):
+            s = saga_indexes[t]
+            distinct[s] = distinct.get(s, 0) + 1
+
+        return (nb_other,) + tuple((s, counts[s], distinct[s]) for s in sorted(counts))
+
+    def price_signature(self, signature: Signature) -> int:
+        """
+        Calcule le total en centimes à partir d'une signature de panier.
+        """
+        total = signature[0] * self.other_unit_price_cents
+        sagas = self.sagas
+        for saga_index, nb_movies, nb_unique in signature[1:]:
+            total += sagas[saga_index].subtotal_cents(nb_movies, nb_unique)
+        return total
+
+    def price_cents(self, title_ids: Sequence[int]) -> int:
+        return self.price_signature(self.signature(title_ids))
+
+# Rules set explicitly with set_rules, otherwise derived from models
+_active_rules: Optional[PricingRules] = None
+_models_rules: Optional[PricingRules] = None
+_models_source: Optional[tuple] = None
+
+def set_rules(rules: Optional[PricingRules]) -> None:
+    """
+    Remplace les règles actives ; None revient aux règles de models.
+    """
+    global _active_rules
+    _active_rules = rules
+
+def load_rules(path: str) -> PricingRules:
+    rules = PricingRules.from_file(path)
+    set_rules(rules)
+    return rules
+
+def get_rules() -> PricingRules:
+    """
+    Retourne les règles actives. Les règles par défaut sont recompilées
+    si les constantes de models ont changé.
+    """
+    global _models_rules, _models_source
+    if _active_rules is not None:
+        return _active_rules
+
+    # Compared against the live objects so that the check does not copy DISCOUNT_RATES
+    if _models_rules is None or _models_source != (models.BTTF_UNIT_PRICE, models.OTHER_UNIT_PRICE,
+                                                   models.DISCOUNT_RATES):
+        _models_rules = PricingRules.from_models()
+        _models_source = models_fingerprint()
+    return _models_rules
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import os
+import signal
+import sys
+from typing import Optional
+from .batch import format_total
+from .cache import PricingCache, DEFAULT_MAXSIZE
+from .calculator import PriceCalculator
+from .client import parse_address
+from .rules import PricingRules, get_rules
+
+# Interval in seconds between two checks of the rules file
+DEFAULT_RELOAD_INTERVAL = 1.0
+
+# Pending output above which the server waits for the client to read
+WRITE_HIGH_WATER = 64 * 1024
+
+# PricingServer class to serve prices from a long-running process
+class PricingServer:
+    def __init__(self, rules_path: Optional[str] = None, cache_size: int = DEFAULT_MAXSIZE,
+                 reload_interval: float = DEFAULT_RELOAD_INTERVAL):
+        """
+        Serveur de prix : chaque requête est une ligne contenant un tableau
+        JSON de titres, chaque réponse une ligne avec le total ou "ERR <message>".
+        Les règles et le catalogue restent chargés entre les requêtes.
+        cache_size à 0 désactive le cache des totaux.
+        """
+        self.rules_path = rules_path
+        self.reload_interval = reload_interval
+        self.cache = PricingCache(cache_size) if cache_size > 0 else None
+        self.rules = PricingRules.from_file(rules_path) if rules_path else get_rules()
+        self._rules_mtime = self._get_mtime()
+
+    def handle_line(self, line: bytes) -> bytes:
+        """
+        Calcule la réponse à une requête. Toute erreur (JSON invalide ou trop
+        imbriqué, règles incohérentes...) devient une réponse "ERR" afin que
+        la connexion et les requêtes suivantes ne soient pas perdues.
+        """
+        try:
+            titles = json.loads(line)
+            if not isinstance(titles, list) or not all(isinstance(t, str) for t in titles):
+                raise ValueError("la requête doit être un tableau JSON de titres")
+
+            total = PriceCalculator.calculate_total_titles([t for t in titles if t.strip()], self.cache, self.rules)
+        except RecursionError:
+            return "ERR requête trop imbriquée\n".encode("utf-8")
+        except Exception as exc:
+            message = str(exc).replace("\n", " ") or type(exc).__name__
+            return f"ERR {message}\n".encode("utf-8")
+        return (format_total(total) + "\n").encode("utf-8")
+
+    def reload(self) -> bool:
+        """
+        Recharge le fichier de règles. En cas d'erreur, les règles courantes
+        sont conservées. Retourne True si les règles ont été remplacées.
+        """
+        if not self.rules_path:
+            return False
+        try:
+            rules = PricingRules.from_file(self.rules_path)
+        except Exception as exc:
+            # Whatever goes wrong, the running rules stay in place and the watcher keeps going
+            print(f"Rechargement des règles impossible : {exc!r}", file=sys.stderr)
+            return False
+
+        # Requests in flight keep the rules they started with, the cache is cleared on first use
+        self.rules = rules
+        return True
+
+    async def start(self, address: str) -> asyncio.AbstractServer:
+        family, target = parse_address(address)
+        if family == "tcp":
+            host, port = target
+            return await asyncio.start_server(self._handle, host, port)
+        return await asyncio.start_unix_server(self._handle, target)
+
+    async def serve(self, address: str) -> None:
+        """
+        Écoute sur l'adresse jusqu'à l'arrêt du processus. Le fichier de
+        règles est surveillé et rechargé à chaud (ou sur SIGHUP).
+        """
+        server = await self.start(address)
+        loop = asyncio.get_running_loop()
+        if self.rules_path and hasattr(signal, "SIGHUP"):
+            loop.add_signal_handler(signal.SIGHUP, self.reload)
+
+        watcher = asyncio.create_task(self._watch_rules())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write("ERR requête trop longue\n".encode("utf-8"))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write(self.handle_line(line))
+                # Pipelined requests are answered without waiting, unless the client lags behind
+                if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                    await writer.drain()
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _watch_rules(self) -> None:
+        if not self.rules_path:
+            return
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            mtime = self._get_mtime()
+            if mtime != self._rules_mtime:
+                self._rules_mtime = mtime
+                self.reload()
+
+    def _get_mtime(self) -> Optional[float]:
+        if not self.rules_path:
+            return None
+        try:
+            return os.stat(self.rules_path).st_mtime
+        except OSError:
+            return None
@@ -0,0 +1,58 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, TextIO, TypeVar
+
+T = TypeVar("T")
+
+# PipelineStats class to collect per-stage timings and counters
+class PipelineStats:
+    def __init__(self):
+        """
+        Temps cumulés par étape (en secondes) et compteurs du pipeline.
+        """
+        self.timings: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def timed_iter(self, stage: str, iterable: Iterable[T]) -> Iterator[T]:
+        """
+        Parcourt iterable en comptant dans stage le temps passé à produire
+        chaque élément (utile pour les générateurs paresseux).
+        """
+        iterator = iter(iterable)
+        perf_counter = time.perf_counter
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(stage, perf_counter() - start)
+                return
+            self.add_time(stage, perf_counter() - start)
+            yield item
+
+    def as_dict(self) -> Dict[str, Dict]:
+        return {"timings": dict(self.timings), "counts": dict(self.counts)}
+
+    def report(self, out: TextIO) -> None:
+        """
+        Écrit les temps par étape et les compteurs, une valeur par ligne.
+        """
+        for stage, seconds in self.timings.items():
+            out.write(f"[stats] {stage:<12} {seconds * 1000:10.1f} ms\n")
+        for name, value in self.counts.items():
+            out.write(f"[stats] {name:<12} {value:10d}\n")
+        out.flush()
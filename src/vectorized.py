@@ -0,0 +1,105 @@
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .models import Movie
+from .rules import BASIS_POINTS, PricingRules, get_rules
+
+# Distinct pairs are counted with a dense (basket, title) table while it stays
+# within DENSE_PAIRS_FACTOR entries per saga movie (plus DENSE_PAIRS_MIN)
+DENSE_PAIRS_FACTOR = 16
+DENSE_PAIRS_MIN = 1 << 16
+
+# VectorizedPriceCalculator class to price a whole batch of baskets with NumPy
+class VectorizedPriceCalculator:
+    @staticmethod
+    def encode(baskets: Iterable[List[Movie]], rules: Optional[PricingRules] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convertit des paniers en tableaux : identifiants de titre du catalogue,
+        offsets des paniers (len(baskets) + 1 valeurs) et index de saga par
+        identifiant (-1 pour les autres films).
+        """
+        rules = rules or get_rules()
+        title_id = rules.catalog.title_id
+        title_ids: List[int] = []
+        offsets: List[int] = [0]
+
+        for movies in baskets:
+            title_ids.extend(title_id(m.title) for m in movies)
+            offsets.append(len(title_ids))
+
+        return (
+            np.asarray(title_ids, dtype=np.int64),
+            np.asarray(offsets, dtype=np.int64),
+            np.asarray(rules.catalog.saga_indexes, dtype=np.int64),
+        )
+
+    @staticmethod
+    def calculate_totals(title_ids: np.ndarray, offsets: np.ndarray, saga_indexes: np.ndarray,
+                         rules: Optional[PricingRules] = None) -> np.ndarray:
+        """
+        Calcule le total de chaque panier du lot en une seule passe de
+        tableaux. Le résultat est identique à PriceCalculator.calculate_total
+        appliqué panier par panier.
+        """
+        return VectorizedPriceCalculator.calculate_totals_cents(title_ids, offsets, saga_indexes, rules) / 100
+
+    @staticmethod
+    def calculate_totals_cents(title_ids: np.ndarray, offsets: np.ndarray, saga_indexes: np.ndarray,
+                               rules: Optional[PricingRules] = None) -> np.ndarray:
+        rules = rules or get_rules()
+        title_ids = np.asarray(title_ids, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        saga_indexes = np.asarray(saga_indexes, dtype=np.int64)
+
+        nb_baskets = len(offsets) - 1
+        if nb_baskets <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        sizes = np.diff(offsets)
+        basket_index = np.repeat(np.arange(nb_baskets, dtype=np.int64), sizes)
+
+        item_sagas = saga_indexes[title_ids]
+        in_saga = item_sagas >= 0
+        saga_baskets = basket_index[in_saga]
+        saga_ids = title_ids[in_saga]
+
+        other_count = sizes - np.bincount(saga_baskets, minlength=nb_baskets)
+        totals = other_count * rules.other_unit_price_cents
+
+        nb_sagas = len(rules.sagas)
+        if nb_sagas == 0 or not len(saga_ids):
+            return totals
+
+        # Movies per (panier, saga)
+        counts = np.bincount(saga_baskets * nb_sagas + item_sagas[in_saga], minlength=nb_baskets * nb_sagas)
+
+        # Distinct (panier, titre) pairs give the number of different volumes per saga
+        nb_titles = len(saga_indexes)
+        pair_keys = saga_baskets * nb_titles + saga_ids
+        if nb_baskets * nb_titles <= DENSE_PAIRS_FACTOR * len(pair_keys) + DENSE_PAIRS_MIN:
+            # Few interned titles: a presence table replaces the sort of np.unique
+            pairs = np.flatnonzero(np.bincount(pair_keys, minlength=nb_baskets * nb_titles))
+        else:
+            pairs = np.unique(pair_keys)
+        pair_baskets, pair_titles = np.divmod(pairs, nb_titles)
+        unique = np.bincount(pair_baskets * nb_sagas + saga_indexes[pair_titles], minlength=nb_baskets * nb_sagas)
+
+        tier_table, unit_prices = VectorizedPriceCalculator._compile_rules(rules)
+        tiers = np.minimum(unique, tier_table.shape[1] - 1).reshape(nb_baskets, nb_sagas)
+        discounts = tier_table[np.arange(nb_sagas), tiers]
+
+        base_price = counts.reshape(nb_baskets, nb_sagas) * unit_prices
+        subtotals = (base_price * (BASIS_POINTS - discounts) + BASIS_POINTS // 2) // BASIS_POINTS
+        return totals + subtotals.sum(axis=1)
+
+    @staticmethod
+    def _compile_rules(rules: PricingRules) -> Tuple[np.ndarray, np.ndarray]:
+        # Tier rows are padded with each saga's last tier so they share one width
+        width = max(len(saga.tiers) for saga in rules.sagas)
+        tier_table = np.asarray(
+            [saga.tiers + (saga.tiers[-1],) * (width - len(saga.tiers)) for saga in rules.sagas],
+            dtype=np.int64,
+        )
+        unit_prices = np.asarray([saga.unit_price_cents for saga in rules.sagas], dtype=np.int64)
+        return tier_table, unit_prices
@@ -0,0 +1,76 @@
+"""
+Tests unitaires pour le panier incrémental.
+"""
+
+import random
+import pytest
+from src import Basket, Movie, PriceCalculator
+
+
+class TestBasket:
+    """Tests pour l'ajout et le retrait de films"""
+
+    def test_add_updates_total(self):
+        basket = Basket()
+        basket.add("Back to the Future 1")
+        assert basket.total() == 15.0
+        basket.add("Back to the Future 2")
+        basket.add("Back to the Future 3")
+        assert basket.total() == 36.0
+        basket.add("La chèvre")
+        assert basket.total() == 56.0
+        assert len(basket) == 4
+
+    def test_remove_drops_discount_tier(self):
+        basket = Basket(["Back to the Future 1", "Back to the Future 2", "Back to the Future 2"])
+        assert basket.discount_rate() == 0.10
+        basket.remove("Back to the Future 1")
+        assert basket.discount_rate() == 0.0
+        assert basket.total() == 30.0
+
+    def test_remove_missing_title_raises(self):
+        basket = Basket(["La chèvre"])
+        with pytest.raises(KeyError):
+            basket.remove("Back to the Future 1")
+        assert basket.total() == 20.0
+
+    def test_other_titles_are_distinct(self):
+        basket = Basket(["La chèvre"])
+        assert "Les Visiteurs" not in basket
+        with pytest.raises(KeyError):
+            basket.remove("Les Visiteurs")
+        basket.remove("la  CHÈVRE")
+        assert len(basket) == 0
+
+    def test_empty_basket(self):
+        assert Basket().total() == 0.0
+
+    def test_uses_slots(self):
+        with pytest.raises(AttributeError):
+            Basket().extra = 1
+
+
+class TestBasketProperties:
+    """Le panier incrémental doit toujours égaler calculate_total"""
+
+    TITLES = [
+        "Back to the Future 1", "Back to the Future 2", "BTTF III", "back to the future 4",
+        "La chèvre", "Les Visiteurs", "Le Dîner de Cons",
+    ]
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_operations_match_calculate_total(self, seed):
+        rng = random.Random(seed)
+        basket = Basket()
+        contents = []
+
+        for _ in range(200):
+            if contents and rng.random() < 0.4:
+                title = contents.pop(rng.randrange(len(contents)))
+                basket.remove(title)
+            else:
+                title = rng.choice(self.TITLES)
+                contents.append(title)
+                basket.add(title)
+
+            assert basket.total() == PriceCalculator.calculate_total([Movie(t) for t in contents])
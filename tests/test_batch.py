@@ -0,0 +1,68 @@
+"""
+Tests unitaires pour le mode batch (plusieurs paniers).
+"""
+
+import io
+import pytest
+import main
+from src import BatchPricer, InputParser, Movie
+
+
+class TestIterBaskets:
+    """Tests pour le découpage paresseux des paniers"""
+
+    def test_baskets_split_by_blank_line(self):
+        lines = io.StringIO("Back to the Future 1\nBack to the Future 2\n\nLa chèvre\n")
+        baskets = list(InputParser.iter_baskets(lines))
+        assert baskets == [
+            (None, [Movie("Back to the Future 1"), Movie("Back to the Future 2")]),
+            (None, [Movie("La chèvre")]),
+        ]
+
+    def test_consecutive_blank_lines_are_one_separator(self):
+        lines = ["Back to the Future 1", "", "  ", "", "La chèvre"]
+        baskets = list(InputParser.iter_baskets(lines))
+        assert len(baskets) == 2
+
+    def test_baskets_with_id_column(self):
+        lines = ["a\tBack to the Future 1", "a\tBack to the Future 3", "b\tLa chèvre"]
+        baskets = list(InputParser.iter_baskets(lines, with_ids=True))
+        assert baskets == [
+            ("a", [Movie("Back to the Future 1"), Movie("Back to the Future 3")]),
+            ("b", [Movie("La chèvre")]),
+        ]
+
+    def test_id_line_without_separator_raises(self):
+        with pytest.raises(ValueError):
+            list(InputParser.iter_baskets(["Back to the Future 1"], with_ids=True))
+
+    def test_is_lazy(self):
+        def lines():
+            yield "Back to the Future 1"
+            yield ""
+            raise AssertionError("la suite ne doit pas être lue")
+
+        assert next(InputParser.iter_baskets(lines())) == (None, [Movie("Back to the Future 1")])
+
+
+class TestBatchPricer:
+    """Tests pour le calcul et l'écriture des totaux en mode batch"""
+
+    def test_price_baskets(self):
+        lines = ["Back to the Future 1", "Back to the Future 3", "", "La chèvre"]
+        assert list(BatchPricer.price_baskets(InputParser.iter_baskets(lines))) == ["27", "20"]
+
+    def test_price_baskets_with_ids(self):
+        lines = ["x\tBack to the Future 1", "y\tBack to the Future 2"]
+        baskets = InputParser.iter_baskets(lines, with_ids=True)
+        assert list(BatchPricer.price_baskets(baskets)) == ["x\t15", "y\t15"]
+
+    def test_write_buffered(self):
+        out = io.StringIO()
+        assert BatchPricer.write_buffered(iter(["1", "2", "3"]), out, buffer_lines=2) == 3
+        assert out.getvalue() == "1\n2\n3\n"
+
+    @pytest.mark.parametrize("value", ["0", "-3"])
+    def test_invalid_buffer_lines_rejected(self, value):
+        with pytest.raises(SystemExit):
+            main.parse_args(["--batch", "--buffer-lines", value])
@@ -0,0 +1,84 @@
+"""
+Tests unitaires pour la mémorisation des totaux par panier.
+"""
+
+import pytest
+import main
+from src import Movie, PriceCalculator, PricingCache
+from src import models
+
+BOX_AND_OTHER = [
+    Movie("Back to the Future 1"),
+    Movie("Back to the Future 2"),
+    Movie("Back to the Future 3"),
+    Movie("La chèvre")
+]
+
+
+class TestPricingCache:
+    """Tests pour le cache LRU des totaux"""
+
+    def test_same_basket_hits(self):
+        cache = PricingCache()
+        assert PriceCalculator.calculate_total(BOX_AND_OTHER, cache) == 56.0
+        assert PriceCalculator.calculate_total(list(BOX_AND_OTHER), cache) == 56.0
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_hit_skips_classification(self, monkeypatch):
+        cache = PricingCache()
+        titles = [m.title for m in BOX_AND_OTHER]
+        assert PriceCalculator.calculate_total_titles(titles, cache) == 56.0
+
+        def unexpected(raw_title):
+            raise AssertionError("titre classé malgré le cache")
+        monkeypatch.setattr(models.CATALOG, "title_id", unexpected)
+        monkeypatch.setattr(models.CATALOG, "known_ids", {})
+        assert PriceCalculator.calculate_total_titles(titles, cache) == 56.0
+
+    def test_reordered_basket_same_total(self):
+        cache = PricingCache()
+        assert PriceCalculator.calculate_total(BOX_AND_OTHER, cache) == 56.0
+        assert PriceCalculator.calculate_total(list(reversed(BOX_AND_OTHER)), cache) == 56.0
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_reordered_ids_hit(self):
+        cache = PricingCache()
+        title_ids = [m.title_id for m in BOX_AND_OTHER]
+        assert PriceCalculator.calculate_total_ids(title_ids, cache) == 56.0
+        assert PriceCalculator.calculate_total_ids(title_ids[::-1], cache) == 56.0
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_cached_totals_match_uncached(self):
+        cache = PricingCache()
+        baskets = [BOX_AND_OTHER, BOX_AND_OTHER[:2], [Movie("Les Visiteurs")], [], BOX_AND_OTHER[:2]]
+        for movies in baskets:
+            assert PriceCalculator.calculate_total(movies, cache) == PriceCalculator.calculate_total(movies)
+
+    def test_lru_is_bounded(self):
+        cache = PricingCache(maxsize=2)
+        for nb_other in range(5):
+            PriceCalculator.calculate_total([Movie("La chèvre")] * nb_other, cache)
+        assert len(cache) == 2
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            PricingCache(maxsize=0)
+
+    def test_invalidated_when_prices_change(self, monkeypatch):
+        cache = PricingCache()
+        assert PriceCalculator.calculate_total(BOX_AND_OTHER, cache) == 56.0
+
+        monkeypatch.setattr(models, "OTHER_UNIT_PRICE", 10.0)
+        assert PriceCalculator.calculate_total(BOX_AND_OTHER, cache) == 46.0
+        assert cache.misses == 2
+
+    def test_invalidated_when_discount_rates_change(self, monkeypatch):
+        cache = PricingCache()
+        assert PriceCalculator.calculate_total(BOX_AND_OTHER, cache) == 56.0
+
+        monkeypatch.setitem(models.DISCOUNT_RATES, 3, 0.50)
+        assert PriceCalculator.calculate_total(BOX_AND_OTHER, cache) == 42.5
+
+    def test_negative_cache_size_rejected(self):
+        with pytest.raises(SystemExit):
+            main.parse_args(["--batch", "--cache-size", "-1"])
@@ -0,0 +1,92 @@
+"""
+Tests unitaires pour le catalogue de titres.
+"""
+
+import pytest
+from src import Catalog, InputParser, Movie, PriceCalculator
+from src.catalog import OTHER_TITLE_ID
+from src import models
+from src.models import CATALOG
+from src.rules import get_rules
+
+
+class TestCatalog:
+    """Tests pour la normalisation et l'indexation des titres"""
+
+    def make_catalog(self, cache_size=16):
+        return Catalog({"Back to the Future": 15.0}, 20.0, {"BTTF": "Back to the Future"}, cache_size)
+
+    def test_same_title_same_id(self):
+        catalog = self.make_catalog()
+        assert catalog.title_id("BTTF 1") == catalog.title_id("Back to the Future 1")
+        assert len(catalog) == 1
+
+    def test_messy_variants_share_id(self):
+        catalog = self.make_catalog()
+        variants = ["Back to the Future 2", "  back  TO the future 2 ", "BTTF II", "Back to the Future Part II"]
+        assert len({catalog.title_id(v) for v in variants}) == 1
+
+    def test_classification(self):
+        catalog = self.make_catalog()
+        bttf = catalog.lookup("BTTF 3")
+        assert (bttf.saga, bttf.volume, bttf.unit_price) == ("Back to the Future", 3, 15.0)
+        other = catalog.lookup("Les Visiteurs")
+        assert (other.saga, other.volume, other.unit_price) == (None, None, 20.0)
+        assert other.title_id == OTHER_TITLE_ID
+        assert catalog.saga_flags == [False, True]
+
+    def test_prices_follow_models(self, monkeypatch):
+        bttf_id = CATALOG.title_id("Back to the Future 1")
+        CATALOG.lookup("La chèvre")
+        monkeypatch.setattr(models, "BTTF_UNIT_PRICE", 10.0)
+        monkeypatch.setattr(models, "OTHER_UNIT_PRICE", 12.0)
+        assert PriceCalculator.calculate_total([Movie("Back to the Future 1"), Movie("La chèvre")]) == 22.0
+        assert CATALOG.lookup("Back to the Future 1").unit_price == 10.0
+        assert CATALOG.lookup("La chèvre").unit_price == 12.0
+        assert CATALOG.title_id("Back to the Future 1") == bttf_id
+
+        monkeypatch.undo()
+        get_rules()
+        assert CATALOG.lookup("La chèvre").unit_price == models.OTHER_UNIT_PRICE
+
+    def test_ids_stable_after_cache_eviction(self):
+        catalog = self.make_catalog(cache_size=2)
+        first = catalog.title_id("BTTF 0")
+        for i in range(1, 10):
+            catalog.title_id(f"BTTF {i}")
+        assert catalog.title_id("BTTF 0") == first
+        assert len(catalog) == 10
+
+    def test_known_ids_bounded(self):
+        catalog = self.make_catalog(cache_size=4)
+        for i in range(100):
+            assert catalog.title_id(f"Film {i}") == OTHER_TITLE_ID
+            assert len(catalog.known_ids) <= 4
+        assert catalog.title_id("BTTF 2") == catalog.known_ids["BTTF 2"]
+
+    def test_other_titles_not_interned(self):
+        catalog = self.make_catalog()
+        assert {catalog.title_id(f"Film {i}") for i in range(200_000)} == {OTHER_TITLE_ID}
+        assert len(catalog) == 0
+        assert len(catalog.entries) == len(catalog.saga_indexes) == 1
+
+    def test_saga_titles_bounded(self, monkeypatch):
+        monkeypatch.setattr("src.catalog.MAX_SAGA_TITLES", 5)
+        catalog = self.make_catalog()
+        for i in range(5):
+            catalog.title_id(f"BTTF {i}")
+        with pytest.raises(ValueError):
+            catalog.title_id("BTTF 5")
+
+
+class TestCatalogPricing:
+    """Tests pour le calcul sur identifiants"""
+
+    def test_parse_ids(self):
+        title_ids = InputParser.parse_ids("Back to the Future 1\n\nBTTF 2\nBTTF III\n")
+        assert PriceCalculator.calculate_total_ids(title_ids) == 36.0
+
+    def test_aliases_count_as_same_volume(self):
+        movies = [Movie("Back to the Future 2"), Movie("BTTF II")]
+        assert PriceCalculator.calculate_total(movies) == 30.0
+        assert Movie("bttf ii").title_id == CATALOG.title_id("Back to the Future 2")
@@ -0,0 +1,68 @@
+"""
+Tests unitaires pour la lecture par projection mémoire.
+"""
+
+import random
+import pytest
+from src import Catalog, InputParser
+from src.rules import get_rules
+
+TITLES = ["Back to the Future 1", "BTTF II", "  back to the future 3 ", "La chèvre", "Les Visiteurs", " "]
+
+
+def as_ids(baskets):
+    title_id = get_rules().catalog.title_id
+    return [(basket_id, [title_id(m.title) for m in movies]) for basket_id, movies in baskets]
+
+
+def write(tmp_path, text):
+    path = tmp_path / "baskets.txt"
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+class TestMappedParser:
+    """Les résultats doivent être identiques à ceux du parseur texte"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_str_parser(self, tmp_path, seed):
+        rng = random.Random(seed)
+        lines = []
+        for _ in range(200):
+            lines.extend(rng.choice(TITLES) for _ in range(rng.randint(1, 4)))
+            lines.extend([rng.choice(["", "  ", "\r"])] * rng.randint(1, 2))
+        path = write(tmp_path, "\n".join(lines))
+
+        with open(path, encoding="utf-8") as stream:
+            expected = as_ids(InputParser.iter_baskets(stream))
+        assert [(i, list(ids)) for i, ids in InputParser.iter_file_ids(path)] == expected
+
+    def test_matches_str_parser_with_ids(self, tmp_path):
+        path = write(tmp_path, "a\tBTTF 1\r\na\tLa chèvre\r\n\r\nb\tBack to the Future 2\r\n\t\n"
+                               "b\tBTTF 3\n \t \n\u00a0\t\nb\tBTTF 1\nc\t\r\n")
+
+        with open(path, encoding="utf-8") as stream:
+            expected = as_ids(InputParser.iter_baskets(stream, with_ids=True))
+        assert [(i, list(ids)) for i, ids in InputParser.iter_file_ids(path, with_ids=True)] == expected
+
+    def test_blocks_split_on_line_boundaries(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.parser.BLOCK_BYTES", 7)
+        path = write(tmp_path, "Back to the Future 1\nLa chèvre\n\nBTTF 2")
+        baskets = [list(ids) for _, ids in InputParser.iter_file_ids(path)]
+        title_id = get_rules().catalog.title_id
+        assert baskets == [[title_id("Back to the Future 1"), title_id("La chèvre")], [title_id("BTTF 2")]]
+
+    def test_empty_file(self, tmp_path):
+        assert list(InputParser.iter_file_ids(write(tmp_path, ""))) == []
+
+    def test_missing_id_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            list(InputParser.iter_file_ids(write(tmp_path, "La chèvre\n"), with_ids=True))
+
+    def test_missing_id_not_cached(self):
+        catalog = Catalog({"Back to the Future": 15.0}, 20.0)
+        with pytest.raises(ValueError):
+            list(InputParser.iter_buffer_ids(b"1\tLa ch\xc3\xa8vre\n\xc2\xa0\nBack to the Future 1\n",
+                                             with_ids=True, catalog=catalog))
+        # The malformed saga line was not interned before the error
+        assert len(catalog) == 0
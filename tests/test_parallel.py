@@ -0,0 +1,99 @@
+"""
+Tests unitaires pour le recalcul parallèle d'un fichier de paniers.
+"""
+
+import io
+import random
+import pytest
+import main
+from src import BatchPricer, InputParser
+from src.batch import DEFAULT_BUFFER_LINES
+from src.parallel import ParallelRepricer
+
+TITLES = ["Back to the Future 1", "Back to the Future 2", "BTTF III", "La chèvre", "Les Visiteurs"]
+
+
+def single_process(path, with_ids=False):
+    out = io.StringIO()
+    with open(path, encoding="utf-8") as stream:
+        BatchPricer.write_buffered(BatchPricer.price_baskets(InputParser.iter_baskets(stream, with_ids)), out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def basket_file(tmp_path):
+    rng = random.Random(7)
+    path = tmp_path / "baskets.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(300):
+            for _ in range(rng.randint(1, 4)):
+                f.write(rng.choice(TITLES) + "\n")
+            f.write("\n" * rng.randint(1, 2))
+    return str(path)
+
+
+@pytest.fixture
+def id_file(tmp_path):
+    rng = random.Random(8)
+    path = tmp_path / "orders.tsv"
+    with open(path, "w", encoding="utf-8") as f:
+        for basket in range(300):
+            for _ in range(rng.randint(1, 4)):
+                f.write(f"order-{basket}\t{rng.choice(TITLES)}\n")
+    return str(path)
+
+
+class TestParallelRepricer:
+    """Tests pour le découpage et la fusion ordonnée"""
+
+    def test_chunks_cover_file(self, basket_file):
+        chunks = list(ParallelRepricer.iter_chunks(basket_file, chunk_size=100))
+        assert chunks[0][0] == 0
+        assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+        with open(basket_file, "rb") as f:
+            data = f.read()
+        assert chunks[-1][1] == len(data)
+        # Every chunk but the last ends right after a blank line
+        assert all(data[end - 2:end] == b"\n\n" for _, end in chunks[:-1])
+
+    @pytest.mark.parametrize("chunk_size", [1, 64, 1000, 10 ** 6])
+    def test_output_identical_to_single_process(self, basket_file, chunk_size):
+        out = io.StringIO()
+        count = ParallelRepricer.reprice_file(basket_file, out, workers=2, chunk_size=chunk_size)
+        assert out.getvalue() == single_process(basket_file)
+        assert count == 300
+
+    def test_output_identical_with_ids(self, id_file):
+        out = io.StringIO()
+        ParallelRepricer.reprice_file(id_file, out, workers=2, chunk_size=50, with_ids=True)
+        assert out.getvalue() == single_process(id_file, with_ids=True)
+
+    @pytest.mark.parametrize("blank", ["\u00a0\n", "\t\n", " \t \n"])
+    @pytest.mark.parametrize("chunk_size", [1, 5, 12])
+    def test_blank_lines_with_ids_do_not_split_baskets(self, tmp_path, blank, chunk_size):
+        path = tmp_path / "orders.tsv"
+        path.write_text(f"11\tBTTF 1\n{blank}11\tBTTF 2\n12\tLa chèvre\n", encoding="utf-8")
+        out = io.StringIO()
+        ParallelRepricer.reprice_file(str(path), out, workers=1, chunk_size=chunk_size, with_ids=True)
+        assert out.getvalue() == single_process(str(path), with_ids=True) == "11\t27\n12\t20\n"
+
+
+class TestWorkersFlag:
+    """Tests pour les options incompatibles avec --workers"""
+
+    @pytest.mark.parametrize("option", [
+        ["--cache-size", "16"], ["--cache-size", "0"], ["--buffer-lines", "10"], ["--mmap"], ["--stats"],
+    ])
+    def test_incompatible_options_rejected(self, basket_file, option):
+        with pytest.raises(SystemExit):
+            main.parse_args(["--batch", "--workers", "2", *option, str(basket_file)])
+
+    @pytest.mark.parametrize("option", [
+        ["--workers", "0"], ["--workers", "-1"], ["--workers", "2", "--chunk-size", "0"],
+    ])
+    def test_invalid_values_rejected(self, basket_file, option):
+        with pytest.raises(SystemExit):
+            main.parse_args(["--batch", *option, str(basket_file)])
+
+    def test_default_buffer_lines(self, basket_file):
+        assert main.parse_args(["--batch", str(basket_file)]).buffer_lines == DEFAULT_BUFFER_LINES
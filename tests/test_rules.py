@@ -0,0 +1,123 @@
+"""
+Tests unitaires pour le moteur de règles de promotions.
+"""
+
+import json
+import random
+import pytest
+import main
+from src import Basket, Movie, PriceCalculator, PricingCache, PricingRules, SagaRule
+
+CONFIG = {
+    "other_unit_price": 20.0,
+    "sagas": [
+        {"name": "Back to the Future", "unit_price": 15.0, "aliases": ["BTTF"],
+         "discounts": {"2": 0.10, "3": 0.20}},
+        {"name": "Star Wars", "unit_price": 18.0, "aliases": ["SW"],
+         "discounts": {"3": 0.10, "6": 0.25}},
+    ],
+}
+
+TITLES = [
+    "Back to the Future 1", "BTTF 2", "Back to the Future 3",
+    "Star Wars 1", "Star Wars 2", "SW III", "Star Wars 4", "Star Wars 5", "Star Wars 6",
+    "La chèvre", "Les Visiteurs",
+]
+
+
+class TestSagaRule:
+    """Tests pour la compilation des paliers"""
+
+    def test_tiers_are_dense(self):
+        saga = SagaRule.compile("Star Wars", 18.0, {3: 0.10, 6: 0.25})
+        assert saga.tiers == (0, 0, 0, 1000, 1000, 1000, 2500)
+        assert saga.unit_price_cents == 1800
+
+    def test_last_tier_applies_beyond(self):
+        saga = SagaRule.compile("Back to the Future", 15.0, {2: 0.10, 3: 0.20})
+        assert saga.discount(10) == 2000
+
+    def test_subtotal_rounded_to_cent(self):
+        saga = SagaRule.compile("Saga", 9.99, {2: 0.15})
+        # 2 x 9.99 x 0.85 = 16.983
+        assert saga.subtotal_cents(2, 2) == 1698
+
+
+class TestPricingRules:
+    """Tests pour le calcul multi-sagas"""
+
+    def test_promotions_per_saga(self):
+        rules = PricingRules.from_config(CONFIG)
+        movies = [Movie(t) for t in ["Star Wars 1", "Star Wars 2", "SW III", "BTTF 1", "BTTF 2", "La chèvre"]]
+        # 3 x 18 x 0.9 + 2 x 15 x 0.9 + 20
+        assert PriceCalculator.calculate_total(movies, rules=rules) == 95.6
+
+    def test_default_rules_unchanged(self):
+        movies = [Movie("Back to the Future 1"), Movie("Back to the Future 2"), Movie("Star Wars 1")]
+        assert PriceCalculator.calculate_total(movies) == 47.0
+
+    def test_from_file(self, tmp_path):
+        path = tmp_path / "promotions.json"
+        path.write_text(json.dumps(CONFIG), encoding="utf-8")
+        rules = PricingRules.from_file(str(path))
+        assert [saga.name for saga in rules.sagas] == ["Back to the Future", "Star Wars"]
+
+    @pytest.mark.parametrize("config", [
+        {"sagas": []},
+        {"other_unit_price": 20.0, "sagas": [{"name": "Saga"}]},
+        {"other_unit_price": 20.0, "sagas": [{"name": "Saga", "unit_price": 10.0, "discounts": {"2": 1.5}}]},
+        {"other_unit_price": 20.0, "sagas": [{"name": "Saga", "unit_price": 10.0, "discounts": {"1000000000": 0.1}}]},
+        {"other_unit_price": 20.0, "sagas": [{"name": "Saga", "unit_price": 10.0, "discounts": {"-1": 0.1}}]},
+        {"other_unit_price": 20.0, "sagas": [{"name": "Saga", "unit_price": 10.0, "discounts": {"deux": 0.1}}]},
+        {"other_unit_price": 20.0, "sagas": [{"name": "Saga", "unit_price": 10.0, "discounts": [[2, 0.1]]}]},
+        {"other_unit_price": 20.0, "sagas": [{"name": "Saga", "unit_price": -1.0}]},
+        {"other_unit_price": -20.0, "sagas": []},
+        {"other_unit_price": "nan", "sagas": []},
+        {"other_unit_price": 20.0, "sagas": ["Saga"]},
+        {"other_unit_price": 20.0, "sagas": {"name": "Saga"}},
+        [],
+    ])
+    def test_invalid_config(self, config):
+        with pytest.raises(ValueError):
+            PricingRules.from_config(config)
+
+    def test_missing_rules_file_rejected(self, tmp_path):
+        with pytest.raises(SystemExit):
+            main.parse_args(["--rules", str(tmp_path / "absent.json")])
+
+    def test_invalid_rules_file_rejected(self, tmp_path, capsys):
+        path = tmp_path / "promotions.json"
+        path.write_text(json.dumps({"other_unit_price": -1, "sagas": []}), encoding="utf-8")
+        with pytest.raises(SystemExit):
+            main.parse_args(["--rules", str(path)])
+        assert "Configuration de promotions invalide" in capsys.readouterr().err
+
+    def test_cache_is_per_rules(self):
+        rules = PricingRules.from_config(CONFIG)
+        cache = PricingCache()
+        movies = [Movie("Star Wars 1"), Movie("Star Wars 2"), Movie("Star Wars 3")]
+        assert PriceCalculator.calculate_total(movies, cache, rules) == 48.6
+        assert PriceCalculator.calculate_total(movies, cache) == 60.0
+
+    def test_basket_matches_calculator(self):
+        rules = PricingRules.from_config(CONFIG)
+        rng = random.Random(3)
+        basket = Basket(rules=rules)
+        contents = []
+        for _ in range(300):
+            if contents and rng.random() < 0.3:
+                basket.remove(contents.pop(rng.randrange(len(contents))))
+            else:
+                contents.append(rng.choice(TITLES))
+                basket.add(contents[-1])
+            assert basket.total() == PriceCalculator.calculate_total([Movie(t) for t in contents], rules=rules)
+
+    def test_vectorized_matches_calculator(self):
+        pytest.importorskip("numpy")
+        from src.vectorized import VectorizedPriceCalculator
+
+        rules = PricingRules.from_config(CONFIG)
+        rng = random.Random(4)
+        baskets = [[Movie(rng.choice(TITLES)) for _ in range(rng.randint(0, 12))] for _ in range(1000)]
+        totals = VectorizedPriceCalculator.calculate_totals(*VectorizedPriceCalculator.encode(baskets, rules), rules)
+        assert totals.tolist() == [PriceCalculator.calculate_total(b, rules=rules) for b in baskets]
@@ -0,0 +1,184 @@
+"""
+Tests unitaires pour le serveur de prix et son client.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import pytest
+import main
+from src.client import PricingClient, parse_address
+from src.server import PricingServer
+
+CONFIG = {
+    "other_unit_price": 20.0,
+    "sagas": [{"name": "Back to the Future", "unit_price": 15.0, "discounts": {"2": 0.10, "3": 0.20}}],
+}
+
+
+class RunningServer:
+    """Serveur lancé dans une boucle asyncio en arrière-plan"""
+
+    def __init__(self, server, address):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.listener = asyncio.run_coroutine_threadsafe(server.start(address), self.loop).result()
+        self.address = address
+        if parse_address(address)[0] == "tcp":
+            host, port = self.listener.sockets[0].getsockname()[:2]
+            self.address = f"{host}:{port}"
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def _close(self):
+        # asyncio servers are not thread-safe, close from the loop thread
+        self.listener.close()
+        await self.listener.wait_closed()
+
+
+@pytest.fixture
+def running_server():
+    running = RunningServer(PricingServer(), "127.0.0.1:0")
+    yield running
+    running.stop()
+
+
+class TestParseAddress:
+    """Tests pour l'interprétation des adresses"""
+
+    def test_tcp(self):
+        assert parse_address("localhost:8765") == ("tcp", ("localhost", 8765))
+        assert parse_address(":8765") == ("tcp", ("127.0.0.1", 8765))
+
+    def test_unix(self):
+        assert parse_address("/tmp/pricing.sock") == ("unix", "/tmp/pricing.sock")
+
+
+class TestPricingServer:
+    """Tests pour le protocole ligne à ligne"""
+
+    def test_handle_line(self):
+        server = PricingServer()
+        line = json.dumps(["Back to the Future 1", "Back to the Future 2", "Back to the Future 3"]).encode()
+        assert server.handle_line(line) == b"36\n"
+
+    def test_cache_disabled(self):
+        server = PricingServer(cache_size=0)
+        assert server.cache is None
+        assert server.handle_line(b'["Back to the Future 1"]') == b"15\n"
+
+    def test_handle_invalid_line(self):
+        assert PricingServer().handle_line(b'{"titre": 1}').startswith(b"ERR ")
+
+    def test_handle_deeply_nested_line(self):
+        assert PricingServer().handle_line(b"[" * 100000 + b"]" * 100000).startswith(b"ERR ")
+
+    def test_handle_pricing_error(self, monkeypatch):
+        def broken(titles, cache=None, rules=None):
+            raise IndexError("tuple index out of range")
+        monkeypatch.setattr("src.server.PriceCalculator.calculate_total_titles", broken)
+        assert PricingServer().handle_line(b'["Back to the Future 1"]').startswith(b"ERR ")
+
+    def test_reload_rules(self, tmp_path):
+        path = tmp_path / "promotions.json"
+        path.write_text(json.dumps(CONFIG), encoding="utf-8")
+        server = PricingServer(str(path))
+        assert server.handle_line(b'["La ch\\u00e8vre"]') == b"20\n"
+
+        CONFIG_UPDATED = dict(CONFIG, other_unit_price=25.0)
+        path.write_text(json.dumps(CONFIG_UPDATED), encoding="utf-8")
+        assert server.reload()
+        assert server.handle_line(b'["La ch\\u00e8vre"]') == b"25\n"
+
+    def test_reload_keeps_rules_on_invalid_file(self, tmp_path):
+        path = tmp_path / "promotions.json"
+        path.write_text(json.dumps(CONFIG), encoding="utf-8")
+        server = PricingServer(str(path))
+
+        path.write_text("{", encoding="utf-8")
+        assert not server.reload()
+        assert server.handle_line(b'["Back to the Future 1"]') == b"15\n"
+
+    def test_reload_survives_unexpected_errors(self, tmp_path, monkeypatch):
+        path = tmp_path / "promotions.json"
+        path.write_text(json.dumps(CONFIG), encoding="utf-8")
+        server = PricingServer(str(path))
+
+        def broken(path):
+            raise AttributeError("règles illisibles")
+        monkeypatch.setattr("src.server.PricingRules.from_file", broken)
+        assert not server.reload()
+        assert server.handle_line(b'["Back to the Future 1"]') == b"15\n"
+
+
+class TestServeFlag:
+    """Tests pour les options incompatibles avec --serve"""
+
+    @pytest.mark.parametrize("option", [
+        ["paniers.txt"], ["--batch"], ["--ids"], ["--mmap"], ["--stats"], ["--buffer-lines", "10"],
+        ["--workers", "2"], ["--chunk-size", "64"],
+    ])
+    def test_incompatible_options_rejected(self, option):
+        with pytest.raises(SystemExit):
+            main.parse_args(["--serve", "127.0.0.1:0", *option])
+
+    def test_cache_size_accepted(self):
+        assert main.parse_args(["--serve", "127.0.0.1:0", "--cache-size", "0"]).cache_size == 0
+
+
+class TestPricingClient:
+    """Tests de bout en bout sur une connexion TCP locale"""
+
+    def test_price(self, running_server):
+        with PricingClient(running_server.address) as client:
+            assert client.price(["Back to the Future 1", "Back to the Future 3"]) == 27.0
+
+    def test_pipelined_requests(self, running_server):
+        baskets = [["Back to the Future 1"] * (i % 3 + 1) + ["La chèvre"] * (i % 2) for i in range(1000)]
+        with PricingClient(running_server.address) as client:
+            totals = client.price_many(baskets, window=100)
+        assert totals == [15.0 * (i % 3 + 1) + 20.0 * (i % 2) for i in range(1000)]
+
+    def test_error_response(self, running_server):
+        with PricingClient(running_server.address) as client:
+            with pytest.raises(ValueError):
+                client._exchange([b"pas du json\n"])
+
+    def test_client_reusable_after_error(self, running_server):
+        with PricingClient(running_server.address) as client:
+            with pytest.raises(ValueError):
+                client.price_many([["BTTF 1"], [1], ["BTTF 1", "BTTF 2"], ["La chèvre"]])
+            assert client.price(["Les Visiteurs", "Les Visiteurs"]) == 40.0
+
+    def test_requests_after_error_are_answered(self, running_server):
+        host, port = parse_address(running_server.address)[1]
+        with socket.create_connection((host, port), timeout=5) as sock:
+            sock.sendall(b"[" * 10000 + b"]" * 10000 + b'\n["La ch\\u00e8vre"]\n')
+            stream = sock.makefile("rb")
+            responses = stream.readline(), stream.readline()
+        assert responses[0].startswith(b"ERR ")
+        assert responses[1] == b"20\n"
+
+    def test_client_does_not_load_pricing_engine(self):
+        code = "import sys, src.client; print(sorted(m for m in sys.modules if m.startswith('src.')))"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+        assert loaded.stdout.strip() == "['src.client']"
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="sockets Unix indisponibles")
+    def test_unix_socket(self, tmp_path):
+        running = RunningServer(PricingServer(), str(tmp_path / "pricing.sock"))
+        try:
+            with PricingClient(running.address) as client:
+                assert client.price(["La chèvre"]) == 20.0
+        finally:
+            running.stop()
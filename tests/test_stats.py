@@ -0,0 +1,80 @@
+"""
+Tests unitaires pour l'instrumentation du pipeline et les benchmarks.
+"""
+
+import io
+import main
+from benchmarks.bench_pipeline import Scenario, compare, generate_baskets, run_scenario
+from src import PipelineStats
+
+
+class TestPipelineStats:
+    """Tests pour les temps par étape et les compteurs"""
+
+    def test_stage_and_counts(self):
+        stats = PipelineStats()
+        with stats.stage("parse"):
+            pass
+        with stats.stage("parse"):
+            pass
+        stats.count("baskets", 3)
+        stats.count("baskets")
+        assert stats.timings["parse"] >= 0.0
+        assert stats.counts == {"baskets": 4}
+
+    def test_timed_iter(self):
+        stats = PipelineStats()
+        assert list(stats.timed_iter("parse", iter([1, 2, 3]))) == [1, 2, 3]
+        assert "parse" in stats.timings
+
+    def test_report(self):
+        stats = PipelineStats()
+        stats.add_time("price", 0.5)
+        stats.count("movies", 7)
+        out = io.StringIO()
+        stats.report(out)
+        assert out.getvalue().splitlines() == [
+            "[stats] price             500.0 ms",
+            "[stats] movies                7",
+        ]
+
+
+class TestStatsFlag:
+    """Tests pour l'option --stats de main.py"""
+
+    def test_batch_stats_on_stderr(self, tmp_path, capsys):
+        path = tmp_path / "baskets.txt"
+        path.write_text("Back to the Future 1\nLa chèvre\n\nBTTF 2\n", encoding="utf-8")
+        main.main(["--batch", "--stats", "--cache-size", "8", str(path)])
+
+        captured = capsys.readouterr()
+        assert captured.out == "35\n15\n"
+        for name in ("parse", "classify", "price", "total", "baskets", "movies", "cache_hits"):
+            assert f"[stats] {name} " in captured.err
+
+    def test_output_unchanged_without_stats(self, tmp_path, capsys):
+        path = tmp_path / "basket.txt"
+        path.write_text("Back to the Future 1\nLa chèvre\n", encoding="utf-8")
+        main.main([str(path)])
+        captured = capsys.readouterr()
+        assert (captured.out, captured.err) == ("35\n", "")
+
+
+class TestBenchmarks:
+    """Tests pour les générateurs et la détection de régressions"""
+
+    SCENARIO = Scenario("test", 50, 1, 5, 0.3, 0.5, seed=1)
+
+    def test_generator_is_seeded(self):
+        assert generate_baskets(self.SCENARIO) == generate_baskets(self.SCENARIO)
+        assert len(generate_baskets(self.SCENARIO, scale=2)) == 100
+
+    def test_compare_flags_regressions(self):
+        results = {"scenarios": {"test": run_scenario(self.SCENARIO, repeat=1)}}
+        assert compare(results, results) == []
+
+        baseline = {"scenarios": {"test": {"stages": {
+            stage: {"baskets_per_s": measure["baskets_per_s"] * 10}
+            for stage, measure in results["scenarios"]["test"]["stages"].items()
+        }}}}
+        assert len(compare(results, baseline)) == len(results["scenarios"]["test"]["stages"])
@@ -0,0 +1,47 @@
+"""
+Tests unitaires pour le moteur de prix vectorisé (NumPy).
+"""
+
+import random
+import pytest
+from src import PriceCalculator, Movie
+
+np = pytest.importorskip("numpy")
+from src.vectorized import VectorizedPriceCalculator
+
+
+class TestVectorizedPriceCalculator:
+    """Tests pour le calcul des totaux par lot"""
+
+    def test_matches_examples(self):
+        baskets = [
+            [Movie("Back to the Future 1"), Movie("Back to the Future 2"), Movie("Back to the Future 3")],
+            [Movie("Back to the Future 1"), Movie("Back to the Future 3")],
+            [Movie("Back to the Future 1"), Movie("Back to the Future 2"),
+             Movie("Back to the Future 3"), Movie("Back to the Future 2")],
+            [Movie("Back to the Future 1"), Movie("Back to the Future 2"),
+             Movie("Back to the Future 3"), Movie("La chèvre")],
+            [],
+        ]
+        totals = VectorizedPriceCalculator.calculate_totals(*VectorizedPriceCalculator.encode(baskets))
+        assert totals.tolist() == [36.0, 27.0, 48.0, 56.0, 0.0]
+
+    @pytest.mark.parametrize("dense", [True, False])
+    def test_matches_calculate_total_on_random_baskets(self, monkeypatch, dense):
+        if not dense:
+            # Forces the np.unique fallback used for large catalogs
+            monkeypatch.setattr("src.vectorized.DENSE_PAIRS_FACTOR", 0)
+            monkeypatch.setattr("src.vectorized.DENSE_PAIRS_MIN", 0)
+        rng = random.Random(42)
+        titles = [Movie(f"Back to the Future {i}") for i in range(1, 5)] + [Movie(f"Film {i}") for i in range(10)]
+        baskets = [[rng.choice(titles) for _ in range(rng.randint(0, 10))] for _ in range(2000)]
+
+        totals = VectorizedPriceCalculator.calculate_totals(*VectorizedPriceCalculator.encode(baskets))
+
+        assert totals.tolist() == [PriceCalculator.calculate_total(b) for b in baskets]
+
+    def test_empty_batch(self):
+        totals = VectorizedPriceCalculator.calculate_totals(
+            np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        )
+        assert totals.shape == (0,)